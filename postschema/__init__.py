@@ -1,13 +1,16 @@
-import inspect
+import asyncio
 import os
+import sys
 
+from collections.abc import Mapping
 from contextlib import suppress
 from copy import deepcopy
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, make_dataclass
 from functools import lru_cache
 from glob import glob
 from hashlib import md5
 from importlib import import_module
+from keyword import iskeyword
 from pathlib import Path
 from typing import Callable, Optional, List, Coroutine
 
@@ -26,10 +29,12 @@ DEFAULT_TZ = os.environ.get("DEFAULT_TZ", 'UTC')
 local_tz = pytz.timezone(DEFAULT_TZ)
 
 from .commons import Commons
-from .core import build_app
+from .core import Base, build_app
 from .decorators import auth
 from .logging import setup_logging
+from .provision_db import setup_db
 from .schema import PostSchema, _schemas as registered_schemas # noqa
+from .scope import ScopeBase
 from .utils import generate_random_word, json_response, dumps, interpolate_env_var
 
 THIS_DIR = Path(__file__).parent
@@ -40,14 +45,30 @@ REDIS_HOST = interpolate_env_var('REDIS_HOST')
 REDIS_PORT = interpolate_env_var('REDIS_PORT')
 REDIS_DB = int(interpolate_env_var('REDIS_DB', '3'))
 REDIS_PASSWORD = interpolate_env_var('REDIS_PASSWORD', None)
+REDIS_POOL_MIN = int(interpolate_env_var('REDIS_POOL_MIN', '5'))
+REDIS_POOL_MAX = int(interpolate_env_var('REDIS_POOL_MAX', '50'))
 POSTGRES_PASSWORD = interpolate_env_var('POSTGRES_PASSWORD')
 POSTGRES_DB = interpolate_env_var('POSTGRES_DB')
 POSTGRES_USER = interpolate_env_var('POSTGRES_USER')
 POSTGRES_HOST = interpolate_env_var('POSTGRES_HOST')
 POSTGRES_PORT = interpolate_env_var('POSTGRES_PORT')
+PG_POOL_MIN = int(interpolate_env_var('PG_POOL_MIN', '10'))
+PG_POOL_MAX = int(interpolate_env_var('PG_POOL_MAX', '10'))
+PG_POOL_RECYCLE = int(interpolate_env_var('PG_POOL_RECYCLE', '3600'))
+PG_DSN = f'dbname={POSTGRES_DB} user={POSTGRES_USER} password={POSTGRES_PASSWORD} host={POSTGRES_HOST} port={POSTGRES_PORT}' # noqa
+REDIS_URL = f'redis://{REDIS_HOST}:{REDIS_PORT}'
 DEFAULT_ROLES = {'*', 'Admin', 'Owner', 'Manager', 'Staff'}
+DEFAULT_ROLES_TITLED = frozenset(role.title() for role in DEFAULT_ROLES)
+# orjson doesn't take sets, so hand it a list to stay on the C path
+DEFAULT_ROLES_JSON = dumps(sorted(DEFAULT_ROLES_TITLED))
 THIS_DIR = Path(__file__).parent
 AUTH_TEMPLATES_DIR = THIS_DIR / 'auth' / 'templates'
+FERNET_KEY = interpolate_env_var('FERNET_KEY')
+if not FERNET_KEY:
+    raise RuntimeError('`FERNET_KEY` environment variable is not set')
+FERNET = Fernet(FERNET_KEY.encode())
+DEFAULT_SMS_SENDER = interpolate_env_var('DEFAULT_SMS_SENDER')
+JINJA_BYTECODE_CACHE = os.environ.get('JINJA_BYTECODE_CACHE', '/tmp/postschema_jinja')
 ROLES = []
 
 ALLOWED_OPERATIONS = ['post', 'patch', 'put', 'delete', 'get', 'list']
@@ -58,9 +79,14 @@ async def default_send_sms(*args):
 
 
 async def cleanup(app):
-    app.redis_cli.close()
-    await app.redis_cli.wait_closed()
-    app.db_pool.terminate()
+    # startup may have failed before any of these got created
+    redis_cli = getattr(app, 'redis_cli', None)
+    if redis_cli is not None:
+        redis_cli.close()
+        await redis_cli.wait_closed()
+    db_pool = getattr(app, 'db_pool', None)
+    if db_pool is not None:
+        db_pool.terminate()
 
 
 async def on_connect_postgres(conn):
@@ -68,27 +94,59 @@ async def on_connect_postgres(conn):
         await cur.execute("SET session TIME ZONE %s", [local_tz.zone])
 
 
-async def init_resources(app):
-    dsn = f'dbname={POSTGRES_DB} user={POSTGRES_USER} password={POSTGRES_PASSWORD} host={POSTGRES_HOST} port={POSTGRES_PORT}' # noqa
-    pool = await aiopg.create_pool(dsn, echo=False, pool_recycle=3600, on_connect=on_connect_postgres)
+async def prewarm_db_pool(pool, size):
+    '''Check out `size` connections at once and run a trivial query on each,
+    forcing every one of them to be (re)established - and dead sockets to be
+    dropped from the pool - before it's handed over to a request handler.'''
+    async def touch():
+        async with pool.acquire() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute('SELECT 1')
+    await asyncio.gather(*(touch() for _ in range(size)))
+
+
+async def init_db_pool(app):
+    pool = await aiopg.create_pool(PG_DSN, echo=False,
+                                   minsize=PG_POOL_MIN,
+                                   maxsize=max(PG_POOL_MIN, PG_POOL_MAX),
+                                   pool_recycle=PG_POOL_RECYCLE,
+                                   on_connect=on_connect_postgres)
+    await prewarm_db_pool(pool, PG_POOL_MIN)
     app.db_pool = pool
-    if REDIS_PASSWORD:
-        redis_pool = await aioredis.create_pool(
-            f"redis://{REDIS_HOST}:{REDIS_PORT}",
-            password=REDIS_PASSWORD,
-            db=REDIS_DB,
-            encoding="utf8")
-    else:
-        redis_pool = await aioredis.create_pool(
-            f"redis://{REDIS_HOST}:{REDIS_PORT}",
-            db=REDIS_DB,
-            encoding="utf8")
+
+
+async def provision_db(app, after_create):
+    '''Run the (blocking) DB provisioning in a worker thread.
+    Any failure propagates, aborting the app's startup.'''
+    loop = asyncio.get_event_loop()
+    try:
+        app.info_logger.debug("Provisioning DB...")
+        await loop.run_in_executor(None, setup_db, Base, after_create)
+        app.info_logger.debug("DB provisioning done")
+    except Exception:
+        app.error_logger.exception("Provisioning failed", exc_info=True)
+        raise
+
+
+async def init_resources(app):
+    await init_db_pool(app)
+    redis_opts = {'password': REDIS_PASSWORD} if REDIS_PASSWORD else {}
+    redis_pool = await aioredis.create_pool(
+        REDIS_URL,
+        db=REDIS_DB,
+        encoding="utf8",
+        minsize=REDIS_POOL_MIN,
+        maxsize=max(REDIS_POOL_MIN, REDIS_POOL_MAX),
+        **redis_opts)
     app.redis_cli = aioredis.Redis(redis_pool)
+    # establish the connections before the traffic arrives
+    await asyncio.gather(*(app.redis_cli.ping() for _ in range(redis_pool.maxsize)))
     app.info_logger.debug("Resources set up OK")
 
 
 async def startup(app):
     app.commons = Commons(app)
+    await provision_db(app, app.after_create)
 
 
 async def reset_form_context(request):
@@ -97,15 +155,16 @@ async def reset_form_context(request):
         raise aiohttp.web.HTTPNotFound()
 
     key = f'postschema:pass:reset:{checkcode}'
-    data = await request.app.redis_cli.hgetall(key)
-    if not data:
+    swapcode, actor_id = await request.app.redis_cli.hmget(key, 'swapcode', 'id')
+    if swapcode is None or actor_id is None:
         raise aiohttp.web.HTTPUnauthorized(reason='Reset link expired or checkcode invalid')
 
-    swapcode = data.pop('swapcode')
     newkey = f'postschema:pass:verify:{swapcode}'
     expire = request.app.config.reset_link_ttl
-    await request.app.redis_cli.delete(key)
-    await request.app.redis_cli.set(newkey, data['id'], expire=expire)
+    tr = request.app.redis_cli.multi_exec()
+    tr.delete(key)
+    tr.set(newkey, actor_id, expire=expire)
+    await tr.execute()
     return swapcode
 
 
@@ -144,7 +203,7 @@ class AppConfig:
 
     # auth
     activate_invited_user_with_sms: bool = False
-    fernet: Fernet = Fernet(interpolate_env_var('FERNET_KEY').encode())
+    fernet: Fernet = FERNET
     redirect_reset_password_to: str = ''
     roles: List[str] = field(default_factory=list)
     password_reset_form_link: str = ''
@@ -170,7 +229,7 @@ class AppConfig:
 
     # sms
     send_sms: Optional[Callable] = None
-    sms_sender: str = interpolate_env_var('DEFAULT_SMS_SENDER')
+    sms_sender: str = DEFAULT_SMS_SENDER
     sms_verification_cta: str = 'Enter code to confirm number: {verification_code}'
 
     # email templating
@@ -194,10 +253,6 @@ class AppConfig:
     on_response_done: Coroutine = None
     metainfo_extender: Callable = None
 
-    def _update(self, cls):
-        for k, v in cls.__dict__.items():
-            setattr(self, k, v)
-
 
 @dataclass(frozen=True)
 class ImmutableConfig:
@@ -212,23 +267,60 @@ def exception_handler(logger):
         exc = context['exception']
         job = context['job']
         coroname = job._coro.__name__
-        logger.error(f'Aiojob exception in {coroname}', exception=exc)
+        logger.error(f'Aiojob exception in {coroname}',
+                     exc_info=(type(exc), exc, exc.__traceback__))
     return wrapped
 
 
-class ConfigBearer(dict):
-    def __getattribute__(self, key):
-        'Allow property access to session context without accessing `self.session_ctxt`'
-        try:
-            return super().__getattribute__(key)
-        except AttributeError:
-            return self[key]
+class ConfigMapping(Mapping):
+    '''Read-only mapping interface of the config (`app.config[...]`, `.get()`, ...),
+    with the options as its keys. The config can't be changed once set up.'''
+
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(self.__slots__)
 
-    def __setattr__(self, key, val):
-        self[key] = val
+    def __len__(self):
+        return len(self.__slots__)
 
-    def __delattr__(self, key):
-        del self[key]
+
+# option names that would shadow the mapping interface
+RESERVED_CONFIG_NAMES = frozenset(dir(ConfigMapping))
+
+
+@lru_cache()
+def config_class(names):
+    '''Build (once per set of option names) a frozen, slotted dataclass
+    so that reading `app.config.<option>` is a plain slot load.'''
+    return make_dataclass('Config', names, bases=(ConfigMapping,), eq=False, frozen=True,
+                          namespace={'__slots__': names})
+
+
+def make_config(sources, extra_config):
+    '''Collect the options from the config dataclasses given in `sources`
+    (later ones win) plus `extra_config`, straight into the frozen config.'''
+    opts = {}
+    for source in sources:
+        opts.update(source.__dict__)
+
+    clashing = opts.keys() & extra_config.keys()
+    if clashing:
+        raise TypeError(f'`extra_config` keys clash with built-in config options: {", ".join(sorted(clashing))}')
+    opts.update(extra_config)
+
+    invalid = [repr(name) for name in opts
+               if not isinstance(name, str) or not name.isidentifier()
+               or iskeyword(name) or name in RESERVED_CONFIG_NAMES]
+    if invalid:
+        raise ValueError('Config option names need to be valid identifiers, '
+                         f'not shadowing the config\'s own methods: {", ".join(invalid)}')
+    return config_class(tuple(opts))(**opts)
 
 
 @dataclass
@@ -318,16 +410,27 @@ async def apispec_metainfo(request):
 
 
 def setup_postschema(app, appname: str, *,
-                     plugin_config={},
-                     extra_config={},
-                     after_create=[],
+                     plugin_config: Optional[dict] = None,
+                     extra_config: Optional[dict] = None,
+                     after_create: Optional[list] = None,
                      **app_config):
 
     roles = app_config.get('roles', [])
-    ROLES = frozenset(role.title() for role in DEFAULT_ROLES | set(roles))
-    os.environ['ROLES'] = dumps(ROLES)
+    if roles:
+        ROLES = DEFAULT_ROLES_TITLED | frozenset(role.title() for role in roles)
+        roles_json = dumps(sorted(ROLES))
+    else:
+        ROLES = DEFAULT_ROLES_TITLED
+        roles_json = DEFAULT_ROLES_JSON
+    os.environ['ROLES'] = roles_json
+
+    plugin_config = plugin_config or {}
+    extra_config = extra_config or {}
+    after_create = after_create or []
 
     app_config = AppConfig(**app_config)
+    # don't write the version/app mode into the caller's dict
+    app_config.initial_logging_context = dict(app_config.initial_logging_context)
     app_config.initial_logging_context['version'] = app_config.version
     app_config.initial_logging_context['app_mode'] = app_config.app_mode = os.environ.get('APP_MODE')
 
@@ -341,6 +444,7 @@ def setup_postschema(app, appname: str, *,
         url_prefix = url_prefix[:-1]
 
     app.app_name = appname
+    app.roles_json = roles_json
     app.url_prefix = url_prefix
     app.app_mode = app_config.app_mode
     app.app_description = app_config.description
@@ -356,11 +460,10 @@ def setup_postschema(app, appname: str, *,
         app_config.error_logger_processors,
         app_config.default_logging_level)
 
+    # these read ROLES from the environment at import time (and middlewares
+    # imports back from this package), so they can't be hoisted
     from . import middlewares
     from .actor import PrincipalActor
-    from .core import Base
-    from .provision_db import setup_db
-    from .scope import ScopeBase
     from .workspace import Workspace  # noqa
 
     ScopeBase._validate_roles(ROLES)
@@ -374,9 +477,13 @@ def setup_postschema(app, appname: str, *,
 
     aiojobs_setup(app, exception_handler=exception_handler(app.error_logger))
 
-    aiohttp_jinja2.setup(app, loader=jinja2.FileSystemLoader(
-        [AUTH_TEMPLATES_DIR, *app_config.template_dirs]
-    ))
+    os.makedirs(JINJA_BYTECODE_CACHE, exist_ok=True)
+    aiohttp_jinja2.setup(
+        app,
+        loader=jinja2.FileSystemLoader([AUTH_TEMPLATES_DIR, *app_config.template_dirs]),
+        bytecode_cache=jinja2.FileSystemBytecodeCache(JINJA_BYTECODE_CACHE),
+        auto_reload=False
+    )
 
     if not app_config.redirect_reset_password_to:
         app_config.redirect_reset_password_to = redirect_reset_password_to = '/passform/{checkcode}/'
@@ -395,9 +502,7 @@ def setup_postschema(app, appname: str, *,
     app.on_cleanup.append(cleanup)
 
     if app_config.alembic_dest is None:
-        stack = inspect.stack()
-        stack_frame = stack[1]
-        calling_module_path = Path(inspect.getmodule(stack_frame[0]).__file__).parent
+        calling_module_path = Path(sys._getframe(1).f_globals['__file__']).parent
         os.environ.setdefault('POSTCHEMA_INSTANCE_PATH', str(calling_module_path))
     else:
         alembic_destination = str(app_config.alembic_dest)
@@ -410,19 +515,18 @@ def setup_postschema(app, appname: str, *,
     app_config.reset_pass_email_html = jinja2.Template(app_config.reset_pass_email_html)
     app_config.verification_email_html = jinja2.Template(app_config.verification_email_html)
 
-    config = ConfigBearer(**extra_config, **plugin_config.__dict__)
-
+    app_config.roles = ROLES
     # extend with immutable config opts
-    app_config._update(ImmutableConfig(scopes=ScopeBase._scopes))
-    config.update(app_config.__dict__)
-    app.config = config
+    app.config = make_config((plugin_config, app_config, ImmutableConfig(scopes=ScopeBase._scopes)),
+                             extra_config)
     app.scopes = frozenset(ScopeBase._scopes)
     app.allowed_roles = frozenset([role for role in ROLES if role not in ['Admin', '*', 'Owner']])
 
+    app.after_create = after_create
     app.principal_actor_schema = PrincipalActor
     app.schemas = registered_schemas
-    app.config.roles = ROLES
     app.send_sms = app_config.send_sms or default_send_sms
+    app.sms_enabled = app_config.send_sms is not None
     app.invitation_link = app_config.invitation_link
     app.created_email_confirmation_link = app_config.created_email_confirmation_link.format(
         url_prefix=url_prefix)
@@ -466,14 +570,6 @@ def setup_postschema(app, appname: str, *,
         request.app.paths_by_roles.roles = set(request.session.roles)
         return json_response(request.app.paths_by_roles.paths_by_roles)
 
-    try:
-        app.info_logger.debug("Provisioning DB...")
-        setup_db(Base, after_create)
-        app.info_logger.debug("DB provisioning done")
-    except Exception:
-        app.error_logger.exception("Provisioning failed", exc_info=True)
-        raise
-
     router.add_get(f'{url_prefix}/doc/', apidoc)
     router.add_get(f'{url_prefix}/doc/openapi.yaml', apispec_context)
     router.add_get(f'{url_prefix}/doc/spec.json', actor_apispec)
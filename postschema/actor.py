@@ -229,10 +229,11 @@ async def send_phone_verification_code(request, phone_num, actor_id):
     verification_code = generate_num_sequence()
     key = f'postschema:activate:phone:{verification_code}'
     await request.app.redis_cli.set(key, actor_id, expire=request.app.config.sms_verification_ttl)
-    msg = request.app.config.sms_verification_cta.format(verification_code=verification_code)
     if APP_MODE == 'test':
         return verification_code
-    await request.app.send_sms(request, phone_num, msg)
+    if request.app.sms_enabled:
+        msg = request.app.config.sms_verification_cta.format(verification_code=verification_code)
+        await request.app.send_sms(request, phone_num, msg)
 
 
 async def login(request, payload, is_trusted=False):
@@ -1409,7 +1410,7 @@ class PrincipalActorBase(RootSchema):
         if request.app.config.activate_invited_user_with_sms:
             # demand the presence of phone field in the payload
             try:
-                payload = await request.json()
+                payload = orjson.loads(await request.read())
             except Exception:
                 raise web.HTTPBadRequest(reason='cannot read payload')
 
@@ -7,7 +7,6 @@ from functools import lru_cache
 import sqlalchemy as sql
 import orjson
 from aiohttp import web
-from aiohttp.hdrs import METH_ALL
 
 from marshmallow import (
     fields,
@@ -34,7 +33,11 @@ from .view_bases import AuxViewBase, ViewsBase
 
 Base = declarative_base()
 
-METH_ALL = [meth.lower() for meth in METH_ALL]
+VIEW_OPS = ('post', 'get', 'patch', 'put', 'delete', 'list')
+# field metadata keys consumed by postschema itself, i.e. not passed on to `sql.Column`
+NON_COLUMN_METADATA = frozenset({
+    'fk', 'read_only', 'is_aware', 'gist_index', 'gin_index', 'identity_constraint'
+})
 JSON_ESCAPABLE_FIELDS = (
     fields.List,
     fields.Mapping,
@@ -48,7 +51,7 @@ def popattr(cls, attr):
 
 
 def getattrs(cls):
-    return {k: v for k, v in cls.__dict__.items() if not k.startswith('__')}
+    return {k: v for k, v in vars(cls).items() if not k.startswith('__')}
 
 
 create_id_const_query = '''DROP TRIGGER IF EXISTS id_constr_{tablename}_{self_col} ON "{tablename}";
@@ -80,7 +83,7 @@ def add_identity_triggers(metadata, identity_constraint):
 def create_model(schema_cls, info_logger): # noqa
     ALLOWED_HOOKS = {'before_create', 'after_create'}
     name = schema_cls.__name__
-    methods = dict(schema_cls.__dict__)
+    methods = vars(schema_cls)
     try:
         tablename = methods.get('__tablename__', getattr(schema_cls, '__tablename__'))
         model_methods = {
@@ -134,15 +137,12 @@ def create_model(schema_cls, info_logger): # noqa
                 args.append(metadata['fk'])
             if 'autoincrement' in metadata:
                 args.append(metadata.pop('autoincrement'))
-            metadict = metadata.copy()
-            metadict.pop('fk', None)
-            metadict.pop('read_only', None)
-            metadict.pop('is_aware', None)
-            if metadict.pop('gist_index', False):
+            metadict = {k: v for k, v in metadata.items() if k not in NON_COLUMN_METADATA}
+            if metadata.get('gist_index', False):
                 indexes[f'{fieldname}_gist_idx'] = [tablename, fieldname, 'gist']
-            if metadict.pop('gin_index', False):
+            if metadata.get('gin_index', False):
                 indexes[f'{fieldname}_gin_idx'] = [tablename, fieldname, 'gin']
-            identity_constraint = metadict.pop('identity_constraint', {})
+            identity_constraint = metadata.get('identity_constraint', {})
             model_methods[fieldname] = sql.Column(field_instance, *args, **metadict, **translated)
 
             # parse identity_constraint
@@ -219,7 +219,6 @@ class ViewMaker:
     def create_aux_views(self, parent_cls_view, perm_builder):
         def gen():
             yield
-        all_ops = ['post', 'get', 'patch', 'put', 'delete', 'list']
 
         class mod_parent_base(parent_cls_view):
             pass
@@ -247,8 +246,8 @@ class ViewMaker:
                 }
                 # view_cls._disallow_authed = perm_builder.disallow_authed
 
-                allowed = [op for op in all_ops if op in view_methods]
-                for op in all_ops:
+                allowed = [op for op in VIEW_OPS if op in view_methods]
+                for op in VIEW_OPS:
                     if hasattr(view_cls, op) and op not in view_methods:
                         setattr(view_cls, op, lambda self: gen().throw(
                             web.HTTPMethodNotAllowed(method=op, allowed_methods=allowed))
@@ -265,13 +264,13 @@ class ViewMaker:
 
     def rebase_metaclass(self):
         meta_cls = self.schema_cls.Meta
-        meta_methods = dict(meta_cls.__dict__)
 
         # force-set common meta attrs
-        meta_methods.setdefault('route_base', self.schema_cls.__name__.lower())
-        meta_methods['render_module'] = orjson
-
-        new_meta = type('Meta', (DefaultMetaBase, ), meta_methods)
+        new_meta = type('Meta', (DefaultMetaBase, ), {
+            'route_base': self.schema_cls.__name__.lower(),
+            **vars(meta_cls),
+            'render_module': orjson
+        })
         self.schema_cls.Meta = new_meta
         return new_meta
 
@@ -347,7 +346,7 @@ class ViewMaker:
 def adjust_fields(schema_cls, all_schemas):
     declared_fields = dict(schema_cls._declared_fields)
     iterables = []
-    rangeables = []
+    rangeables = {}
     for coln, colv in declared_fields.items():
         meta = colv.metadata
         if not colv.required or meta.get('primary_key', False):
@@ -364,7 +363,7 @@ def adjust_fields(schema_cls, all_schemas):
                     validator = validate.Length(max=sqlfield.length)
                     colv.validators.append(validator)
         elif isinstance(colv, postschema_fields.RangeDTField):
-            rangeables.append(coln)
+            rangeables[coln] = meta.get('is_aware', False)
         elif isinstance(colv, JSON_ESCAPABLE_FIELDS):
             # ensure relation fields are not included
             if not isinstance(colv, postschema_fields.Relationship):
@@ -64,7 +64,8 @@ class RangeDTField(RangeField):
 
 class Set(fields.List):
     def _deserialize(self, *args, **kwargs):
-        return list(set(super()._deserialize(*args, **kwargs)))
+        # dedupe in a single pass, keeping the first-seen order
+        return list(dict.fromkeys(super()._deserialize(*args, **kwargs)))
 
 
 class Relationship:
@@ -34,12 +34,16 @@ def escape_iterable(fieldnames):
     return wrapped
 
 
-def escape_rangeable(fieldnames):
+def escape_rangeable(fields_awareness):
+    # pick each field's range class once, instead of looking it up on every write
+    range_classes = {
+        fieldname: DateTimeTZRange if is_aware else DateTimeRange
+        for fieldname, is_aware in fields_awareness.items()
+    }
+
     def wrapped(payload, view_instance, **kwargs):
-        for fieldname in fieldnames:
+        for fieldname, range_cls in range_classes.items():
             with suppress(KeyError):
-                is_aware = view_instance.schema.declared_fields[fieldname].metadata.get('is_aware', False)
-                range_cls = DateTimeTZRange if is_aware else DateTimeRange
                 payload[fieldname] = range_cls(*payload[fieldname])
         return payload
     return wrapped
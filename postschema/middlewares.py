@@ -84,7 +84,7 @@ async def prepare_shielded_response(request, handler):
         if shield_method == 'sms':
             if APP_MODE == 'test':
                 context['code'] = code
-            else:
+            elif request.app.sms_enabled:
                 msg = request.app.config.sms_shield_msg.format(code=code)
                 await request.app.send_sms(request, request.session.phone, msg)
         elif shield_method == 'otp' and APP_MODE == 'test':
@@ -1,4 +1,5 @@
 import os
+import random
 import shutil
 from glob import glob
 from pathlib import Path
@@ -8,7 +9,9 @@ from time import sleep
 import bcrypt
 from alembic.config import Config
 from alembic import command
+from psycopg2.errorcodes import DUPLICATE_DATABASE
 from sqlalchemy import create_engine, event
+from sqlalchemy.exc import OperationalError, ProgrammingError
 from sqlalchemy.schema import DDL
 
 from .logging import setup_logging
@@ -19,6 +22,7 @@ APP_MODE = os.environ.get("APP_MODE", 'test')
 THIS_DIR = Path(__file__).parent
 BASE_DIR = THIS_DIR  # / "postschema"
 FNS_PATTERN = BASE_DIR / "sql" / "functions" / "*.sql"
+FUNCTION_SQLS = tuple(Path(fn_sql).read_text() for fn_sql in sorted(glob(str(FNS_PATTERN))))
 POSTGRES_PASSWORD = interpolate_env_var('POSTGRES_PASSWORD')
 POSTGRES_DB = interpolate_env_var('POSTGRES_DB')
 
@@ -27,6 +31,11 @@ POSTGRES_ADMIN_USER = interpolate_env_var('POSTGRES_ADMIN_USER', POSTGRES_USER)
 POSTGRES_ADMIN_PASSWORD = interpolate_env_var('POSTGRES_ADMIN_PASSWORD', POSTGRES_PASSWORD)
 POSTGRES_HOST = interpolate_env_var('POSTGRES_HOST')
 POSTGRES_PORT = interpolate_env_var('POSTGRES_PORT')
+CONNECT_RETRIES = 10
+CONNECT_MAX_WAIT = 30
+POOL_SIZE = int(interpolate_env_var('POSTSCHEMA_POOL_SIZE', '20'))
+POOL_OVERFLOW = int(interpolate_env_var('POSTSCHEMA_POOL_OVERFLOW', '30'))
+POOL_RECYCLE = int(interpolate_env_var('POSTSCHEMA_POOL_RECYCLE', '1800'))
 
 info_logger, error_logger, _ = setup_logging()
 
@@ -36,22 +45,18 @@ def get_url():
 
 
 def before_create(event, metadata):
-    for fn_sql in glob(str(FNS_PATTERN)):
-        event.listen(
-            metadata,
-            'before_create',
-            DDL(open(fn_sql).read())
-        )
+    # register a single DDL batch, so that it's shipped to the DB in one round trip
     stmts = [
+        *FUNCTION_SQLS,
         "CREATE EXTENSION IF NOT EXISTS btree_gist",
         "CREATE EXTENSION IF NOT EXISTS pg_trgm"
     ]
-    for stmt in stmts:
-        event.listen(
-            metadata,
-            'before_create',
-            DDL(stmt)
-        )
+    # terminate every statement ourselves, rather than trusting each .sql file to end with `;`
+    event.listen(
+        metadata,
+        'before_create',
+        DDL(';\n'.join(stmt.rstrip().rstrip(';') for stmt in stmts) + ';')
+    )
 
 
 def make_alembic_dir():
@@ -63,7 +68,7 @@ def make_alembic_dir():
     if not os.path.exists(alembic_destination):
         src = THIS_DIR / 'alembic'
         shutil.copytree(src, alembic_destination)
-        os.mkdir(versions_dest)
+    os.makedirs(versions_dest, exist_ok=True)
     if not os.path.exists(alembic_ini_destination):
         src = THIS_DIR / 'alembic.ini'
         shutil.copy2(src, alembic_ini_destination)
@@ -89,33 +94,41 @@ def setup_db(Base, after_create):
     alembic_ini_destination, postschema_instance_path = make_alembic_dir()
     uri = f'postgresql://{POSTGRES_ADMIN_USER}:{POSTGRES_ADMIN_PASSWORD}@{POSTGRES_HOST}:{POSTGRES_PORT}/'
     engine = create_engine(uri + "postgres")
-    time_wait = 1
-    retries = 10
-    while retries >= 0:
+    for attempt in range(CONNECT_RETRIES):
         try:
             conn = engine.connect()
             conn.execute("COMMIT")
             info_logger.debug("Connected!")
             break
-        except Exception:
-            info_logger.warn(f"! Can't connect to DB. Waiting {time_wait}s...")
+        except OperationalError:
+            time_wait = min(2 ** attempt, CONNECT_MAX_WAIT) + random.uniform(0, 0.5)
+            info_logger.warn(f"! Can't connect to DB. Waiting {time_wait:.1f}s...")
             sleep(time_wait)
-            time_wait *= 2
-            retries -= 1
-    if retries == 0:
+    else:
         raise RuntimeError("Couldn't establish a DB connection. Terminating")
 
     try:
-        conn.execute("CREATE DATABASE %s" % POSTGRES_DB)
-    except Exception as perr:
-        if "already exists" not in str(perr):
+        exists = conn.execute("SELECT 1 FROM pg_database WHERE datname=%s", (POSTGRES_DB,)).scalar()
+        if not exists:
+            conn.execute(f'CREATE DATABASE "{POSTGRES_DB}"')
+    except ProgrammingError as perr:
+        # another worker might have created it in the meantime
+        if perr.orig.pgcode != DUPLICATE_DATABASE:
             raise
     finally:
         conn.close()
         engine.dispose()
 
     uri += POSTGRES_DB
-    engine = create_engine(uri, pool_recycle=3600)
+    engine = create_engine(
+        uri,
+        pool_size=POOL_SIZE,
+        max_overflow=POOL_OVERFLOW,
+        pool_recycle=POOL_RECYCLE,
+        pool_pre_ping=True,
+        pool_use_lifo=True,
+        connect_args={'keepalives': 1, 'keepalives_idle': 30, 'keepalives_interval': 10}
+    )
     conn = engine.connect()
 
     before_create(event, Base.metadata)
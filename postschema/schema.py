@@ -1,5 +1,6 @@
 import asyncio
 import itertools
+from contextvars import ContextVar
 
 from marshmallow.schema import ValidationError, BaseSchema as MarshmallowBaseSchema, SchemaMeta
 from sqlalchemy.ext.declarative import declarative_base
@@ -8,10 +9,33 @@ from .auth.perms import COMPOSITE_OPS, PublicPrivatePerms
 
 Base = declarative_base()
 
+# app and session of the request whose payload is being validated.
+# Schema instances are shared among concurrent requests, so these can't live on them.
+validation_app = ContextVar('validation_app')
+validation_session = ContextVar('validation_session')
+
+
+class ValidationContextMixin:
+    '''Exposes the app and session of the request being validated to schema hooks'''
+
+    @property
+    def app(self):
+        return validation_app.get()
+
+    @property
+    def session(self):
+        return validation_session.get()
+
 
 class DefaultMetaBase:
     enable_extended_search = False
     create_views = True
+    # Seconds to keep GET responses cached in-process for; 0 disables it.
+    # The cache is per process (and per view), so it's only safe for data that tolerates
+    # staleness up to the TTL: it's cleared only by writes going through this very view,
+    # so writes made by other workers, through other views (e.g. to joined tables),
+    # from after_* hooks or straight to the DB are served stale until the entry expires.
+    get_cache_ttl = 0
     excluded_ops = []
     exclude_from_updates = []
 
@@ -58,7 +82,7 @@ class _schemascls:
 _schemas = _schemascls()
 
 
-class PostSchemaBase(MarshmallowBaseSchema):
+class PostSchemaBase(ValidationContextMixin, MarshmallowBaseSchema):
 
     Base = Base
 
@@ -109,7 +133,6 @@ class PostSchemaBase(MarshmallowBaseSchema):
     def is_read_schema(self):
         return self._use == 'read'
 
-
 class PostSchemaMeta(SchemaMeta):
 
     def __new__(cls, name, bases, methods):
@@ -12,9 +12,6 @@ from psycopg2.extras import Json as PsycopJson
 
 NUMSET = list(string.digits)
 random.shuffle(NUMSET)
-PG_ERR_PAT = re.compile(
-    r'(?P<prefix>([\s\w]|_)+)\((?P<name>.*?)\)\=\((?P<val>.*?)\)(?P<reason>.*)'
-)
 PG_CONSTR_PAT = re.compile(
     r'constraint \"(?P<constraint>\w+)\"'
 )
@@ -34,8 +31,11 @@ def dumps(val):
         return json.dumps(val, default=def_dump)
 
 
-def Json(val):
-    return PsycopJson(val, dumps=dumps)
+class Json(PsycopJson):
+    '''psycopg2 JSON adapter serializing through orjson'''
+
+    def dumps(self, obj):
+        return dumps(obj)
 
 
 def generate_random_word(ln=10):
@@ -47,22 +47,31 @@ def generate_num_sequence(ln=4):
 
 
 def json_response(data, **kwargs):
-    kwargs.setdefault("dumps", dumps)
-    return web.json_response(data, **kwargs)
+    if 'dumps' in kwargs:
+        return web.json_response(data, **kwargs)
+    # hand orjson's bytes straight to the response, skipping the str round trip
+    try:
+        body = orjson.dumps(data, option=ORJSON_FLAGS)
+    except orjson.JSONEncodeError:
+        body = json.dumps(data, default=def_dump).encode()
+    kwargs.setdefault('content_type', 'application/json')
+    return web.Response(body=body, **kwargs)
 
 
 def parse_postgres_err(perr):
-    res = PG_ERR_PAT.search(perr.diag.message_detail)
+    message_detail = perr.diag.message_detail
+    if not message_detail or ')=(' not in message_detail:
+        # nothing of the `Key (name)=(val) ...` form to parse
+        return {'error': message_detail}
+    # `Key (name, ...)=(val, ...) reason`, split on its fixed delimiters
+    prefix, _, rest = message_detail.partition('(')
+    names, _, rest = rest.partition(')=(')
+    vals, _, reason = rest.partition(')')
+    reason = reason.strip()
     errs = {}
-    if res:
-        parsed = res.groupdict()
-        prefix = parsed['prefix']
-        names = parsed['name'].split(', ')
-        vals = parsed['val'].split(', ')
-        reason = parsed['reason'].strip()
-        for key, val in zip(names, vals):
-            errs[key] = [f'{prefix}({val}) ' + reason]
-    return errs or {'error': perr.diag.message_detail}
+    for key, val in zip(names.split(', '), vals.split(', ')):
+        errs[key] = [f'{prefix}({val}) ' + reason]
+    return errs or {'error': message_detail}
 
 
 def parse_postgres_constraint_err(perr):
@@ -75,11 +84,12 @@ def retype_schema(cls, new_methods):
     '''Extend schema class `cls` with `new_methods` dict,
     containing new attributes/methods.'''
 
-    methods = dict(cls.__dict__)
-    for k, v in methods.pop('_declared_fields', {}).items():
-        methods[k] = v
-    methods.update(new_methods)
-    return type(cls.__name__, cls.__bases__, methods)
+    cls_attrs = vars(cls)
+    return type(cls.__name__, cls.__bases__, {
+        **{k: v for k, v in cls_attrs.items() if k != '_declared_fields'},
+        **cls_attrs.get('_declared_fields', {}),
+        **new_methods
+    })
 
 
 def seconds_to_human(ttl_seconds):
@@ -96,7 +106,7 @@ def interpolate_env_var(envvar, default_value=None, template=re.compile(r'(<<(.*
     main_val = os.environ.get(envvar, default_value)
     if not main_val:
         return main_val
-    inter_hit = set(re.findall(template, main_val))
+    inter_hit = set(template.findall(main_val))
     inter_dict = {templ_key: os.environ.get(key, '') for (templ_key, key) in inter_hit}
     for key, sub in inter_dict.items():
         main_val = main_val.replace(key, sub)
@@ -1,7 +1,24 @@
-from marshmallow import ValidationError
+from marshmallow import ValidationError, validate
 from .utils import Json
 
 
+class OneOf(validate.OneOf):
+    '''`validate.OneOf` testing membership against a set, rather than the choices list'''
+
+    def __init__(self, choices, *args, **kwargs):
+        super().__init__(choices, *args, **kwargs)
+        self._choices_set = frozenset(self.choices)
+
+    def __call__(self, value):
+        try:
+            if value in self._choices_set:
+                return value
+        except TypeError:
+            # unhashable, so can't be one of the choices either
+            pass
+        raise ValidationError(self._format_error(value))
+
+
 def must_not_be_empty(val):
     if not val:
         raise ValidationError('Data not provided')
@@ -1,5 +1,6 @@
 import weakref
 
+from collections import defaultdict as dd
 from contextlib import suppress
 
 from aiohttp import web
@@ -15,11 +16,16 @@ class ViewsTemplate:
     async def get(self):
         # validate the query payload
         empty_payload_exc = None
-        try:
-            cleaned_payload = await self._validate_singular_payload()
-        except web.HTTPError as exc:
-            empty_payload_exc = exc
+        if not self.request.body_exists:
+            # nothing to read, let alone validate
+            empty_payload_exc = web.HTTPBadRequest(reason='cannot read payload')
             cleaned_payload = {}
+        else:
+            try:
+                cleaned_payload = await self._validate_singular_payload()
+            except web.HTTPError as exc:
+                empty_payload_exc = exc
+                cleaned_payload = {}
 
         if not cleaned_payload:
             if self.request.session.is_authed and hasattr(self.schema.Meta, 'default_get_critera'):
@@ -32,14 +38,15 @@ class ViewsTemplate:
                 raise post_exceptions.ValidationError({'payload': ['Empty payload is not accepted']})
 
         self.cleaned_payload_keys = list(cleaned_payload) or []
-        get_query = dict(self.request.query)
-        base_stmt = await self._parse_select_fields(
-            get_query, self._prepare_get_query) or self.get_query_stmt
+        get_query_raw = self.request.query
+        base_stmt = self.get_query_stmt
+        if 'select' in get_query_raw:
+            base_stmt = await self._parse_select_fields(get_query_raw, self._prepare_get_query)
 
-        if hasattr(self.schema, 'get'):
+        if 'get' in self.schema_hooks:
             return await self.schema.get(self.request, cleaned_payload)
 
-        if hasattr(self.schema, 'before_get'):
+        if 'before_get' in self.schema_hooks:
             cleaned_payload = await self.schema.before_get(self.request, cleaned_payload) or cleaned_payload
 
         return await self._fetch(cleaned_payload, base_stmt)
@@ -66,39 +73,43 @@ class ViewsTemplate:
 
         # validate the GET payload, if present
         get_query_raw = self.request.query
-        get_query = dict(get_query_raw)
-
-        if 'order_by' in get_query:
-            unified_order_field = get_query_raw.getall('order_by')
-            if ',' in unified_order_field[0]:
-                unified_order_field = unified_order_field[0].split(',')
-            get_query['order_by'] = unified_order_field
-
-        base_stmt = await self._parse_select_fields(
-            get_query, self._prepare_list_query) or self.list_query_stmt
+        base_stmt = self.list_query_stmt
+        if 'select' in get_query_raw:
+            base_stmt = await self._parse_select_fields(get_query_raw, self._prepare_list_query)
+
+        get_query = get_query_raw
+        if 'order_by' in get_query_raw or 'select' in get_query_raw:
+            # only copy the query when it needs reshaping for the pagination schema
+            get_query = dict(get_query_raw)
+            get_query.pop('select', None)
+            if 'order_by' in get_query:
+                unified_order_field = get_query_raw.getall('order_by')
+                if ',' in unified_order_field[0]:
+                    unified_order_field = unified_order_field[0].split(',')
+                get_query['order_by'] = unified_order_field
 
         pagination_data = await self._validate_singular_payload(
             get_query or {}, self.pagination_schema, 'query')
         limit = pagination_data['limit']
         page = pagination_data['page'] - 1
-        offset = page * limit
-        orderby = ','.join(f'"{self.tablename}".{field}' for field in pagination_data['order_by'])
-        orderhow = pagination_data['order_dir'].upper()
 
-        if hasattr(self.schema, 'before_list'):
+        if 'before_list' in self.schema_hooks:
             cleaned_payload = await self.schema.before_list(self.request, cleaned_payload) or cleaned_payload
 
-        query = base_stmt.format(
-            limit=limit,
-            offset=offset,
-            orderby=orderby,
-            orderhow=orderhow)
+        query = self._render_list_query(
+            base_stmt, tuple(pagination_data['order_by']), pagination_data['order_dir'])
 
-        return await self._fetch(cleaned_payload, query)
+        return await self._fetch(cleaned_payload, query, {
+            '_limit': limit,
+            '_offset': page * limit
+        })
 
     async def post(self):
         # get the payload
         payload = await self.payload
+        if isinstance(payload, list):
+            return await self._post_many(payload)
+
         with suppress(AttributeError):
             # allow custom schema method to modify the payload before validation
             payload = await self.schema.procure_payload(self.request, payload)
@@ -106,7 +117,7 @@ class ViewsTemplate:
         cleaned_payload = await self._validate_singular_payload(payload=payload)
         cleaned_payload = self._clean_write_payload(cleaned_payload)
 
-        if hasattr(self.schema, 'before_post'):
+        if 'before_post' in self.schema_hooks:
             cleaned_payload = await self.schema.before_post(
                 weakref.proxy(self), self.request, cleaned_payload) or cleaned_payload
 
@@ -126,16 +137,71 @@ class ViewsTemplate:
                     })
                     raise post_exceptions.CreateFailed()
 
-        if hasattr(self.schema, 'after_post'):
+        if 'after_post' in self.schema_hooks:
             await spawn(self.request, self.schema.after_post(self.request, cleaned_payload, res[0]))
 
         return json_response({self.pk_column_name: res[0]})
 
+    async def _post_many(self, payloads):
+        '''Bulk variant of `post`: rows sharing the same set of columns
+        are inserted with a single multi-row INSERT, all in one transaction.'''
+        if not payloads:
+            raise post_exceptions.ValidationError({'payload': ['Empty payload is not accepted']})
+
+        shapes = dd(list)
+        for i, payload in enumerate(payloads):
+            with suppress(AttributeError):
+                payload = await self.schema.procure_payload(self.request, payload)
+
+            cleaned_payload = await self._validate_singular_payload(payload=payload, envelope_key=str(i))
+            cleaned_payload = self._clean_write_payload(cleaned_payload)
+
+            if 'before_post' in self.schema_hooks:
+                cleaned_payload = await self.schema.before_post(
+                    weakref.proxy(self), self.request, cleaned_payload) or cleaned_payload
+
+            shapes[tuple(cleaned_payload)].append((i, cleaned_payload))
+
+        created = [None] * len(payloads)
+
+        async with self.request.app.db_pool.acquire() as conn:
+            async with conn.cursor() as cur:
+                async with cur.begin():
+                    for rows in shapes.values():
+                        row_payloads = [row for _, row in rows]
+                        insert_query = self._render_insert_many_query(cur, row_payloads)
+                        if insert_query is not None:
+                            # the params are already bound by mogrify
+                            await self.request.app.commons.execute(cur, insert_query, None)
+                            res = await cur.fetchall()
+                        else:
+                            res = []
+                            for row in row_payloads:
+                                await self.request.app.commons.execute(
+                                    cur, self._render_insert_query(row), row)
+                                res.append(await cur.fetchone())
+
+                        if len(res) != len(rows) or None in res:
+                            if self.request.session:
+                                raise web.HTTPConflict(
+                                    reason='Illegal cross workspace insert or non-existent FK supplied')
+                            raise post_exceptions.CreateFailed()
+
+                        for (i, _), created_row in zip(rows, res):
+                            created[i] = created_row[0]
+
+        if 'after_post' in self.schema_hooks:
+            for rows in shapes.values():
+                for i, cleaned_payload in rows:
+                    await spawn(self.request, self.schema.after_post(self.request, cleaned_payload, created[i]))
+
+        return json_response({self.pk_column_name: created})
+
     async def put(self):
         cleaned_select, cleaned_payload = await self._clean_update_payload()
         cleaned_payload = self._clean_write_payload(cleaned_payload)
 
-        if hasattr(self.schema, 'before_update'):
+        if 'before_update' in self.schema_hooks:
             cleaned_payload = await self.schema.before_update(weakref.proxy(self), self.request, cleaned_payload, cleaned_select) \
                 or cleaned_payload
 
@@ -145,13 +211,8 @@ class ViewsTemplate:
         except AttributeError:
             extended_fields = {}
         query_with_where, query_values = self._whereize_query(cleaned_select, query_raw, extended_fields)
-        updates = []
-
-        for payload_k, payload_v in cleaned_payload.items():
-            updates.append(f"{payload_k}=%({payload_k})s")
-            query_values[payload_k] = payload_v
-
-        query = query_with_where.format(updates=','.join(updates))
+        query_values.update(cleaned_payload)
+        query = self._render_update_query(query_with_where, tuple(cleaned_payload))
 
         async with self.request.app.db_pool.acquire() as conn:
             async with conn.cursor() as cur:
@@ -163,7 +224,7 @@ class ViewsTemplate:
                     })
                     raise post_exceptions.UpdateFailed()
 
-        if hasattr(self.schema, 'after_put'):
+        if 'after_put' in self.schema_hooks:
             await spawn(self.request,
                         self.schema.after_put(self.request, cleaned_select, cleaned_payload, res))
 
@@ -173,10 +234,10 @@ class ViewsTemplate:
         cleaned_select, cleaned_payload = await self._clean_update_payload()
         cleaned_payload = self._clean_write_payload(cleaned_payload)
 
-        if hasattr(self.schema, 'patch'):
+        if 'patch' in self.schema_hooks:
             return await self.schema.patch(self.request, cleaned_select, cleaned_payload)
 
-        if hasattr(self.schema, 'before_update'):
+        if 'before_update' in self.schema_hooks:
             cleaned_payload = await self.schema.before_update(
                 weakref.proxy(self), self.request, cleaned_payload, cleaned_select) or cleaned_payload
 
@@ -186,16 +247,8 @@ class ViewsTemplate:
         except AttributeError:
             extended_fields = {}
         query_with_where, query_values = self._whereize_query(cleaned_select, query_raw, extended_fields)
-        updates = []
-
-        for payload_k, payload_v in cleaned_payload.items():
-            if payload_k in self.mergeable_fields:
-                updates.append(f"{payload_k}=jsonb_merge_deep({payload_k}, %({payload_k})s)")
-            else:
-                updates.append(f"{payload_k}=%({payload_k})s")
-            query_values[payload_k] = payload_v
-
-        query = query_with_where.format(updates=','.join(updates))
+        query_values.update(cleaned_payload)
+        query = self._render_update_query(query_with_where, tuple(cleaned_payload), merge=True)
 
         async with self.request.app.db_pool.acquire() as conn:
             async with conn.cursor() as cur:
@@ -207,7 +260,7 @@ class ViewsTemplate:
                     })
                     raise post_exceptions.UpdateFailed()
 
-        if hasattr(self.schema, 'after_patch'):
+        if 'after_patch' in self.schema_hooks:
             await spawn(self.request,
                         self.schema.after_patch(self.request, cleaned_select, cleaned_payload, res))
 
@@ -217,8 +270,7 @@ class ViewsTemplate:
         cleaned_payload = await self._validate_singular_payload()
 
         # validate the GET payload, if present
-        get_query_raw = self.request.query
-        get_query = dict(get_query_raw)
+        get_query = self.request.query
         # for now, we only support 'deep' param, which denotes that only M2M references of the given model
         # are to be deleted together with the parent.
         # TODO: specify which chidren
@@ -231,10 +283,10 @@ class ViewsTemplate:
                 ]
             })
 
-        if hasattr(self.schema, 'delete'):
+        if 'delete' in self.schema_hooks:
             return await self.schema.delete(self.request, cleaned_payload)
 
-        if hasattr(self.schema, 'before_delete'):
+        if 'before_delete' in self.schema_hooks:
             cleaned_payload = await self.schema.before_delete(self.request, cleaned_payload) \
                 or cleaned_payload
 
@@ -269,33 +321,16 @@ class ViewsTemplate:
                             'query': cur.query.decode()
                         })
                         raise post_exceptions.DeleteFailed()
-                    deleted_ids = res[0]
-
-                    try:
-                        deleted_resource_instances = len(deleted_ids)
-                    except TypeError:
-                        deleted_resource_instances = deleted_ids
-
-                    # post-delete hooks, only for the m2m relations
-                    if self.schema._m2m_cherrypicks:
-                        m2m_query = self.cherrypick_m2m_stmts.format(deleted_pks=f'array{deleted_ids}')
-                        try:
-                            await self.request.app.commons.execute(cur, m2m_query)
-                        except Exception as exc:
-                            self.request.app.error_logger.exception(
-                                'Failed to execute the deletion of M2M dependencies', query=m2m_query)
-                            await cur.execute('rollback;')
-                            raise exc
-
-                        res = await cur.fetchone()
-                        if not res or not res[0]:
-                            await cur.execute('rollback;')
-                            self.request.app.error_logger.exception(
-                                'Failed to delete the resource\'s M2M dependencies', query=m2m_query)
-                            raise post_exceptions.DeleteFailed(body="Failed to delete the M2M dependencies")
-                        deleted_m2m_refs = res[0]
-
-        if hasattr(self.schema, 'after_delete'):
+                    # plain deletes return the count, deep ones the deleted ids and their count,
+                    # followed by the summary of M2M references stripped in the same statement
+                    if len(res) == 1:
+                        deleted_resource_instances = res[0]
+                    else:
+                        deleted_resource_instances = res[1]
+                        if self.schema._m2m_cherrypicks:
+                            deleted_m2m_refs = res[2]
+
+        if 'after_delete' in self.schema_hooks:
             await spawn(self.request, self.schema.after_delete(self.request, cleaned_payload, res))
 
         return json_response({
@@ -1,5 +1,5 @@
+import re
 import warnings
-import weakref
 
 import orjson
 from aiohttp import web
@@ -8,8 +8,10 @@ from collections import deque, defaultdict as dd
 from contextlib import suppress
 from functools import lru_cache
 from importlib import import_module
+from string import Formatter
+from time import monotonic
 
-from marshmallow import Schema, ValidationError, fields, validate, post_load
+from marshmallow import Schema, ValidationError, fields, post_load
 from sqlalchemy.sql.schema import Sequence
 
 from . import exceptions as post_exceptions
@@ -20,40 +22,54 @@ from .fields import (
     AutoSessionField, AutoSessionForeignResource,
     RangeDTField, TimeRange
 )
-from .exceptions import WrongType
 from .hooks import translate_naive_nested, translate_naive_nested_to_dict
-from .schema import DefaultMetaBase
-from .utils import json_response, retype_schema
-from .validators import must_not_be_empty, adjust_children_field
-
+from .schema import DefaultMetaBase, ValidationContextMixin, validation_app, validation_session
+from .utils import dumps, retype_schema
+from .validators import OneOf, must_not_be_empty, adjust_children_field
+
+GET_CACHE_MAXSIZE = 1024
+WRITE_OPS = frozenset({'post', 'put', 'patch', 'delete'})
+PLACEHOLDER_PAT = re.compile(r'%%|%\((\w+)\)s')
+AUX_FIELD_LOCATIONS = frozenset({'path', 'query', 'header', 'body', 'form'})
 NESTABLE_FIELDS = (fields.Dict, fields.Nested, Set)
 ITERABLE_FIELDS = (Set, fields.List)
 NON_ITERABLE_FIELDS = (Relationship, TimeRange, RangeDTField)
+SCHEMA_HOOKS = (
+    'get', 'patch', 'delete',
+    'before_get', 'before_list', 'before_post', 'before_update', 'before_delete',
+    'after_post', 'after_put', 'after_patch', 'after_delete'
+)
 
 
-class FormatDict(dict):
-    def __missing__(self, key):
-        return f'{{{key}}}'
+class SQLTemplate(str):
+    '''Query template with its `{placeholders}` parsed once, upon creation.
+    Placeholders not given to `format` are left in place, to be filled in later on.'''
 
+    def __new__(cls, template):
+        inst = super().__new__(cls, template)
+        inst._parts = tuple(
+            (literal, fieldname) for literal, fieldname, _, _ in Formatter().parse(template))
+        return inst
 
-class FallbackString(str):
     def format(self, **kwargs):
-        kk = FormatDict(kwargs)
-        return self.format_map(kk)
+        return ''.join(
+            literal if fieldname is None else literal + kwargs.get(fieldname, f'{{{fieldname}}}')
+            for literal, fieldname in self._parts)
 
 
 def adjust_pagination_schema(pagination_schema, schema_cls, list_by_fields, pk):
     declared_fields = pagination_schema._declared_fields
     cls_name = pagination_schema.__name__
-    MANDATORY_PAGINATION_FIELDS._cls_name = cls_name
+    cls_path = f'{pagination_schema.__module__}.{cls_name}'
 
-    try:
-        MANDATORY_PAGINATION_FIELDS(**declared_fields)
-    except TypeError as datacls_err:
-        raise TypeError(f'Custom pagination class {pagination_schema.__module__}.{cls_name}.'
-                        + datacls_err.args[0])
-    except WrongType as wrong_type:
-        raise TypeError(wrong_type)
+    unexpected = declared_fields.keys() - MANDATORY_PAGINATION_FIELDS.keys()
+    if unexpected:
+        raise TypeError(f'Custom pagination class {cls_path} declares unexpected fields: {", ".join(unexpected)}')
+    for fieldname, expected_type in MANDATORY_PAGINATION_FIELDS.items():
+        if fieldname not in declared_fields:
+            raise TypeError(f'Custom pagination class {cls_path} is missing the `{fieldname}` field')
+        if not isinstance(declared_fields[fieldname], expected_type):
+            raise TypeError(f"Pagination class {cls_name}'s `{fieldname}` is not of {expected_type} type")
 
     # Construct a brand new pagination class based on `pagination_schema`
     # to include `list_by_fields` as an argument to `OneOf` validator of `order_by` field.
@@ -70,7 +86,7 @@ def adjust_pagination_schema(pagination_schema, schema_cls, list_by_fields, pk):
         translate_naive_nested(schema_cls, 'order_by'))
 
     orig_validators = pagination_methods['order_by'].validate or []
-    orig_validators.append(validate.OneOf(list_by_fields))
+    orig_validators.append(OneOf(list_by_fields))
 
     missing_val = pagination_methods['order_by'].missing or [pk]
     pagination_methods['order_by'] = fields.List(
@@ -80,6 +96,29 @@ def adjust_pagination_schema(pagination_schema, schema_cls, list_by_fields, pk):
     return type(cls_name, (Schema, ), pagination_methods)
 
 
+def fold_iterables(multidict, iterable_fields):
+    '''Flatten a headers/query MultiDict into a dict, collecting iterable fields' values
+    into lists, be they passed as repeated keys or comma-joined'''
+    flat = dict(multidict)
+    if not iterable_fields:
+        return flat
+    for fieldname in iterable_fields:
+        if fieldname in flat:
+            flat[fieldname] = [item for value in multidict.getall(fieldname) for item in value.split(',')]
+    return flat
+
+
+def join_selects(select_dict, tablename):
+    '''Render `json_build_object` arguments for the selected fields,
+    nesting the ones of joined tables'''
+    return ','.join(
+        f"'{k}', \"{tablename}\".{v}"
+        if not isinstance(v, dict)
+        else f"'{k}', json_build_object({join_selects(v, '_' + k + '_j')})"
+        for k, v in select_dict.items()
+    )
+
+
 def make_select_fields_schema(schema_cls):
     def _get_all_selectable_fields():
         declared_fields = dict(schema_cls._declared_fields)
@@ -92,9 +131,10 @@ def make_select_fields_schema(schema_cls):
     nested_map = {}
 
     return type(f'{schema_cls.__name__}Selects', (Schema, ), {
+        'selectable_fields': frozenset(allowed_fields),
         'select': fields.List(
             fields.String(
-                validate=[validate.OneOf(list(allowed_fields))]
+                validate=[OneOf(list(allowed_fields))]
             )
         ),
         'clean_payload': post_load(
@@ -185,9 +225,6 @@ class CommonViewMixin:
             warnings.warn("Can't validate payload without body schema")
             return {}
 
-        ref_schema.session = weakref.proxy(self.request.session)
-        ref_schema.app = weakref.proxy(self.request.app)
-
         try:
             autosession_fields = ref_schema._autosession_fields
         except AttributeError:
@@ -195,18 +232,24 @@ class CommonViewMixin:
 
         self.extend_payload_with_session(payload_used, autosession_fields)
 
+        app_token = validation_app.set(self.request.app)
+        session_token = validation_session.set(self.request.session)
         err_msg = None
         try:
-            loaded = ref_schema.load(payload_used)
-        except ValidationError as merr:
-            if raise_orig:
-                raise merr
-            err_msg = merr.messages
-            raise post_exceptions.ValidationError(err_msg if not envelope_key else {envelope_key: err_msg})
-
-        with suppress(AttributeError):
-            # ignore validating \w schemas not inheriting from PostSchema
-            err_msg = await ref_schema.run_async_validators(payload_used) or err_msg
+            try:
+                loaded = ref_schema.load(payload_used)
+            except ValidationError as merr:
+                if raise_orig:
+                    raise merr
+                err_msg = merr.messages
+                raise post_exceptions.ValidationError(err_msg if not envelope_key else {envelope_key: err_msg})
+
+            with suppress(AttributeError):
+                # ignore validating \w schemas not inheriting from PostSchema
+                err_msg = await ref_schema.run_async_validators(payload_used) or err_msg
+        finally:
+            validation_app.reset(app_token)
+            validation_session.reset(session_token)
 
         if err_msg:
             raise post_exceptions.ValidationError(err_msg if not envelope_key else {envelope_key: err_msg})
@@ -225,36 +268,40 @@ class AuxViewMeta(type):
 
         schemas = dd(dict)
         iterable_fields = []
-        allowed_locations = ['path', 'query', 'header', 'body', 'form']
         invmap = {}
-        for k, v in methods.copy().items():
+        validator_hooks = []
+        for k, v in methods.items():
             if isinstance(v, fields.Field):
                 meta = v.metadata
                 try:
                     location = meta['location']
                 except KeyError:
                     raise KeyError(f'Field `{name}.{k}` need to define `location` attribute')
-                if location not in allowed_locations:
+                if location not in AUX_FIELD_LOCATIONS:
                     raise AttributeError(f'Location {location} (defined on `{k}`) is invalid')
                 if location == 'path':
                     v.required = True
-                elif location in ['query', 'header'] and isinstance(v, ITERABLE_FIELDS):
+                elif location in ('query', 'header') and isinstance(v, ITERABLE_FIELDS):
                     iterable_fields.append(k)
-                schemas[location][k] = methods.pop(k)
+                schemas[location][k] = v
                 invmap[k] = location
+            elif callable(v) and '__marshmallow_hook__' in v.__dict__:
+                validator_hooks.append((k, v))
 
-        for k, v in methods.copy().items():
-            if callable(v) and '__marshmallow_hook__' in v.__dict__:
-                try:
-                    fieldname = v.__marshmallow_hook__['validates']['field_name']
-                except KeyError:
-                    fieldname = None
-                if fieldname in invmap:
-                    location = invmap[fieldname]
-                    schemas[location][k] = methods.get(k)
+        # fields move onto their location's schema
+        for k in invmap:
+            del methods[k]
+
+        for k, v in validator_hooks:
+            try:
+                fieldname = v.__marshmallow_hook__['validates']['field_name']
+            except KeyError:
+                fieldname = None
+            if fieldname in invmap:
+                schemas[invmap[fieldname]][k] = v
 
         schemas = {
-            f'{k}_schema': type('PathSchema', (Schema,), v)()
+            f'{k}_schema': type('PathSchema', (ValidationContextMixin, Schema), v)()
             for k, v in schemas.items()
         }
 
@@ -272,7 +319,7 @@ class AuxViewMeta(type):
         methods['Meta'] = new_meta
 
         methods.update({
-            '_iterable_fields': iterable_fields,
+            '_iterable_fields': tuple(iterable_fields),
             **schemas
         })
         return super(AuxViewMeta, cls).__new__(cls, name, bases, methods)
@@ -336,7 +383,7 @@ class AuxViewBase(web.View, CommonViewMixin):
     async def payload(self):
         '''Refers to JSON payload transmitted in body'''
         try:
-            return await self.request.json(loads=orjson.loads)
+            return orjson.loads(await self.request.read())
         except Exception:
             raise web.HTTPBadRequest(reason='cannot read payload')
 
@@ -344,34 +391,18 @@ class AuxViewBase(web.View, CommonViewMixin):
     async def form_payload(self):
         return await self.request.post()
 
-    @property
-    @lru_cache()
+    @cached_property
     def header_payload(self):
-        headers_raw = self.request.headers
-        headers = dict(headers_raw)
-        for fieldname in self._iterable_fields:
-            if fieldname in headers:
-                unified_order_field = headers_raw.getall(fieldname)
-                if ',' in unified_order_field[0]:
-                    unified_order_field = unified_order_field[0].split(',')
-                headers[fieldname] = unified_order_field
-        return headers
+        return fold_iterables(self.request.headers, self._iterable_fields)
 
-    @property
-    @lru_cache()
+    @cached_property
     def query_payload(self):
-        get_query_raw = self.request.query
-        get_query = dict(get_query_raw)
-        for fieldname in self._iterable_fields:
-            if fieldname in get_query:
-                unified_order_field = get_query_raw.getall(fieldname)
-                if ',' in unified_order_field[0]:
-                    unified_order_field = unified_order_field[0].split(',')
-                get_query[fieldname] = unified_order_field
-        return get_query
+        return fold_iterables(self.request.query, self._iterable_fields)
 
 
 class ViewsClassBase(web.View):
+    get_cache_ttl = 0
+
     def __init__(self, request):
         self._request = request
         self.operation = request.operation
@@ -387,7 +418,10 @@ class ViewsClassBase(web.View):
         method = getattr(self, self.request.operation, None)
         if method is None:
             self._raise_allowed_methods()
-        return await method()
+        resp = await method()
+        if self.get_cache_ttl and self.operation in WRITE_OPS:
+            self.get_cache.clear()
+        return resp
 
     @classmethod
     def relationize_schema(cls, joins):
@@ -409,6 +443,9 @@ class ViewsClassBase(web.View):
     def post_init(cls, joins):
         from .contrib import Pagination
         cls.has_autopk = False
+        cls.insert_many_query_stmt = None
+        # resolve the optional schema hooks once, rather than probing for them per request
+        cls.schema_hooks = frozenset(hook for hook in SCHEMA_HOOKS if hasattr(cls.schema_cls, hook))
         cls.schemas = import_module('postschema.schema')._schemas
         table = cls.model.__table__
         declared_fields = cls.schema_cls._declared_fields.items()
@@ -436,15 +473,21 @@ class ViewsClassBase(web.View):
         private_meta = getattr(cls.schema_cls, 'Private', None)
         authed_meta = getattr(cls.schema_cls, 'Authed', None)
 
+        cls.get_cache_ttl = getattr(meta_cls, 'get_cache_ttl', 0)
+        # (query, values) -> (expiry, response text); reset by every write made through this view
+        cls.get_cache = {}
+
         cls._naive_fields_to_composite_stmts()
         cls.schema_cls._special_output_processing = cls._find_special_output_fields()
         cls.schema_cls._join_to_schema_where_stmt = joins
+        # the schema-level WHERE/SELECT translation maps, for direct per-request access
+        cls._nested_where_stmts = cls.schema_cls._nested_where_stmts
+        cls._nested_select_stmts = getattr(cls.schema_cls, '_nested_select_stmts', {})
+        cls._m2m_where_stmts = cls.schema_cls._m2m_where_stmts
+        cls._join_to_schema_where_stmt = joins
+
+        selects_nested_map = cls._nested_select_stmts
 
-        try:
-            selects_nested_map = cls.schema_cls._nested_select_stmts
-        except AttributeError:
-            selects_nested_map = {}
-        
         common_order_by = getattr(meta_cls, 'order_by', None) or [cls.pk_column_name]
 
         public_get_by = getattr(public_meta, 'get_by', None) or [cls.pk_column_name]
@@ -474,6 +517,7 @@ class ViewsClassBase(web.View):
                                                          cls.schema_cls, common_order_by,
                                                          cls.pk_column_name)()
         cls.select_schema = make_select_fields_schema(cls.schema_cls)()
+        cls.selectable_fields = cls.select_schema.selectable_fields
 
         excluded = getattr(schema_metacls, 'exclude_from_updates', [])
         update_excluded = [*excluded, *read_only_fields]
@@ -496,7 +540,7 @@ class ViewsClassBase(web.View):
             }
         }
 
-        cls.update_query_stmt = FallbackString(f"""
+        cls.update_query_stmt = SQLTemplate(f"""
             WITH rows AS (
                 UPDATE "{cls.schema_cls.__tablename__}"
                 SET {{updates}}
@@ -506,7 +550,7 @@ class ViewsClassBase(web.View):
             )
             SELECT count(*) FROM rows""")
 
-        cls.delete_query_stmt = FallbackString(f"""
+        cls.delete_query_stmt = SQLTemplate(f"""
             WITH rows AS (
                 DELETE FROM "{cls.schema_cls.__tablename__}"
                 {{using}}
@@ -516,15 +560,15 @@ class ViewsClassBase(web.View):
             SELECT count(*) FROM rows""")
 
         # render delete statements for linked tables, in case of deep delete request
-        cls.delete_deep_query_stmt = FallbackString(f"""
+        m2m_ctes, m2m_summary = cls._render_cherrypick_m2m_stmts()
+        cls.delete_deep_query_stmt = SQLTemplate(f"""
             WITH rows AS (
                 DELETE FROM "{cls.schema_cls.__tablename__}"
                 WHERE {{where}}
                 RETURNING {cls.pk_column_name}::text
-            )
-            SELECT json_agg(rows.{cls.pk_column_name}) FROM rows;
+            ){m2m_ctes}
+            SELECT json_agg(rows.{cls.pk_column_name}), count(*){m2m_summary} FROM rows;
         """)
-        cls.cherrypick_m2m_stmts = cls._render_cherrypick_m2m_stmts()
 
         public_get_joins, public_list_joins = cls._prepare_join_statements(
             joins, public_get_by, public_list_by)
@@ -538,30 +582,45 @@ class ViewsClassBase(web.View):
                                        autosession_fields=autosession_fields)
         cls.patch_schema = cls.put_schema = write_schema(use='write', partial=True, exclude=update_excluded)
 
-        read_schema = cls.relationize_schema(joins) or cls.schema_cls
+        read_schema_cls = cls.relationize_schema(joins) or cls.schema_cls
+        read_schemas = {}
+
+        def read_schema(joins, only):
+            # request types tend to share selectors (they fall back on each other),
+            # so share the equally configured schema instances too
+            key = (tuple(joins.items()), tuple(only))
+            if key not in read_schemas:
+                read_schemas[key] = read_schema_cls(use='read', joins=joins, only=only, partial=True)
+            return read_schemas[key]
+
         cls.schema_variants = {
             'public': {
-                'get_schema': read_schema(
-                    use='read', joins=public_get_joins, only=public_get_by, partial=True),
-                'list_schema': read_schema(
-                    use='read', joins=public_list_joins, only=public_list_by, partial=True),
-                'delete_schema': read_schema(
-                    use='read', joins=public_get_joins, partial=True, only=public_delete_by)
+                'get_schema': read_schema(public_get_joins, public_get_by),
+                'list_schema': read_schema(public_list_joins, public_list_by),
+                'delete_schema': read_schema(public_get_joins, public_delete_by)
             },
             'authed': {
-                'get_schema': read_schema(use='read', joins=auth_get_joins, only=auth_get_by, partial=True),
-                'list_schema': read_schema(use='read', joins=auth_list_joins, only=auth_list_by, partial=True),
-                'delete_schema': read_schema(
-                    use='read', joins=auth_get_joins, partial=True, only=auth_delete_by)
+                'get_schema': read_schema(auth_get_joins, auth_get_by),
+                'list_schema': read_schema(auth_list_joins, auth_list_by),
+                'delete_schema': read_schema(auth_get_joins, auth_delete_by)
             },
             'private': {
-                'get_schema': read_schema(
-                    use='read', joins=private_get_joins, only=private_get_by, partial=True),
-                'list_schema': read_schema(
-                    use='read', joins=private_list_joins, only=private_list_by, partial=True),
-                'delete_schema': read_schema(
-                    use='read', joins=private_get_joins, partial=True, only=private_delete_by)
+                'get_schema': read_schema(private_get_joins, private_get_by),
+                'list_schema': read_schema(private_list_joins, private_list_by),
+                'delete_schema': read_schema(private_get_joins, private_delete_by)
+            }
+        }
+        # operation -> schema lookup table, per request type
+        cls.operation_schemas = {
+            request_type: {
+                'post': cls.post_schema,
+                'put': cls.put_schema,
+                'patch': cls.patch_schema,
+                'get': variants['get_schema'],
+                'list': variants['list_schema'],
+                'delete': variants['delete_schema']
             }
+            for request_type, variants in cls.schema_variants.items()
         }
 
     @classmethod
@@ -632,17 +691,9 @@ class ViewsClassBase(web.View):
 
         metacls_name = request_type.title()
 
-        def _join_selects(select_dict, tablename):
-            return ','.join(
-                f"'{k}', \"{tablename}\".{v}"
-                if not isinstance(v, dict)
-                else f"'{k}', json_build_object({_join_selects(v, '_' + k + '_j')})"
-                for k, v in select_dict.items()
-            )
-
         tablename = cls.schema_cls.__tablename__
         tablename_cte = f'{tablename}_cte'
-        joined_fields = dd(dict)
+        joined_fields = {}
         extra_fields = {}
 
         joins_to_schemas = cls.schema_cls._join_to_schema_where_stmt
@@ -671,7 +722,7 @@ class ViewsClassBase(web.View):
                 }
                 linked_selects = cls._prepare_selects(linked_list_by_select, linked_schema) \
                     if compile_selects else linked_list_by_select
-                joined_fields[getter_field].update(linked_selects)
+                joined_fields[getter_field] = linked_selects
 
             elif getter_field in special_output_processing:
                 extra_fields[getter_field] = special_output_processing[getter_field]
@@ -683,23 +734,23 @@ class ViewsClassBase(web.View):
         }
         main_selects.update(joined_fields)
 
-        select_stmt = _join_selects(main_selects, tablename)
+        select_stmt = join_selects(main_selects, tablename)
         if extra_fields:
             select_stmt += ',' + ','.join(f"'{k}',{v}" for k, v in extra_fields.items())
 
         # selects = cls._prepare_selects(list_by) if compile_selects else list_by
         # select = ','.join(f"'{k}',{tablename}.{v}" for k, v in selects.items())
-        return FallbackString(f'''WITH "{tablename_cte}" AS (
+        return SQLTemplate(f'''WITH "{tablename_cte}" AS (
                 SELECT json_build_object({select_stmt}) AS js,
                        count(*) OVER() AS full_count
                        FROM "{tablename}" {{joins}}
                        WHERE {{where}}
                        ORDER BY {{orderby}} {{orderhow}}
             )
-            SELECT json_build_object('data', json_agg(js), 'total_count', t.ct) FROM (
+            SELECT json_build_object('data', json_agg(js), 'total_count', t.ct)::text FROM (
                 SELECT js, {tablename_cte}.full_count as ct FROM "{tablename_cte}"
-                LIMIT {{limit}}
-                OFFSET {{offset}}
+                LIMIT %(_limit)s
+                OFFSET %(_offset)s
             ) t
             GROUP BY t.ct
         ''')
@@ -709,15 +760,7 @@ class ViewsClassBase(web.View):
 
         metacls_name = request_type.title()
 
-        def _join_selects(select_dict, tablename):
-            return ','.join(
-                f"'{k}', \"{tablename}\".{v}"
-                if not isinstance(v, dict)
-                else f"'{k}', json_build_object({_join_selects(v, '_' + k + '_j')})"
-                for k, v in select_dict.items()
-            )
-
-        joined_fields = dd(dict)
+        joined_fields = {}
         joins_to_schemas = cls.schema_cls._join_to_schema_where_stmt
         special_output_processing = cls.schema_cls._special_output_processing
         extra_fields = {}
@@ -744,7 +787,7 @@ class ViewsClassBase(web.View):
                 }
                 linked_selects = cls._prepare_selects(linked_get_by_select, linked_schema) \
                     if compile_selects else linked_get_by_select
-                joined_fields[getter_field].update(linked_selects)
+                joined_fields[getter_field] = linked_selects
 
             elif getter_field in special_output_processing:
                 extra_fields[getter_field] = special_output_processing[getter_field]
@@ -756,10 +799,10 @@ class ViewsClassBase(web.View):
             if '__' not in field
         }
         main_selects.update(joined_fields)
-        select_stmt = _join_selects(main_selects, tablename)
+        select_stmt = join_selects(main_selects, tablename)
         if extra_fields:
             select_stmt += ',' + ','.join(f"'{k}',{v}" for k, v in extra_fields.items())
-        return f'''SELECT json_build_object({select_stmt}) AS "inner"
+        return f'''SELECT json_build_object({select_stmt})::text AS "inner"
                FROM "{tablename}" {{joins}} WHERE {{where}}'''
 
     @classmethod
@@ -846,6 +889,12 @@ class ViewsClassBase(web.View):
                     f'RETURNING {cls.pk_column_name}')
 
         colnames = ','.join(insert_cols)
+        # multi-row variant, used by bulk POSTs: (head, row, tail)
+        cls.insert_many_query_stmt = (
+            f'INSERT INTO "{cls.tablename}" ({colnames}{{cols}}) VALUES ',
+            f'( {valnames}{{vals}} )',
+            f' RETURNING {cls.pk_column_name}'
+        )
         return f"""INSERT INTO "{cls.tablename}" ({colnames}{{cols}})
             VALUES ( {valnames}{{vals}} )
             {{on_conflict}}
@@ -856,43 +905,46 @@ class ViewsClassBase(web.View):
         this_tablename = cls.schema_cls.__tablename__
         this_table_pk = cls.pk_column_name
         stmt = '\n'.join(
-            FallbackString(f"""WITH rows AS (
+            f"""WITH rows AS (
                     DELETE FROM "{foreign_table}"
                     USING "{this_tablename}"
                     WHERE "{foreign_table}"."{foreign_pk}"="{this_tablename}"."{linking_field}"
                     AND "{this_tablename}".{this_table_pk} = ANY({{deleted_ids}})
-                )""")
+                )"""
             for foreign_pk, foreign_table, linking_field in cls.schema_cls._deletion_cascade
         ) or ''
         return stmt
 
     @classmethod
     def _render_cherrypick_m2m_stmts(cls):
-        query = ',\n'.join(FallbackString(f"""{foreign_table}_cte AS (
+        '''Render the CTEs stripping the deleted pks (selected from the deep delete's `rows`)
+        off the linked tables' M2M arrays, along with the column summarizing them.'''
+        pk = cls.pk_column_name
+        ctes = ''.join(f""",
+            {foreign_table}_cte AS (
             UPDATE "{foreign_table}"
                 SET "{foreign_field}" = (SELECT (SELECT jsonb_agg(t.e) FROM (
                     SELECT jsonb_array_elements_text("{foreign_field}") AS e
-                ) t))-{{deleted_pks}}
+                ) t))-(SELECT array_agg(rows.{pk}) FROM rows)
                 FROM (
                     SELECT DISTINCT("inner".id) AS id FROM (
                         SELECT {foreign_pk}, jsonb_array_elements_text("{foreign_field}") AS j
                         FROM "{foreign_table}"
                     ) "inner"
-                    WHERE "inner".j = ANY({{deleted_pks}})
+                    WHERE "inner".j IN (SELECT rows.{pk} FROM rows)
                 ) "outer"
                 WHERE "{foreign_table}".{foreign_pk} = "outer".id
                 RETURNING 1
             ),
             {foreign_table}_cte_summed AS (
                 SELECT count(*) AS out FROM {foreign_table}_cte
-            )""") for foreign_table, foreign_field, foreign_pk in cls.schema_cls._m2m_cherrypicks) or ''
-        if query:
-            summary_core = ','.join(f"""'{fktable}', "{fktable}_cte_summed".out """
-                                    for fktable, *_ in cls.schema_cls._m2m_cherrypicks)
-            summary = f'json_build_object({summary_core})'
-            froms = ','.join(f'"{fktable}_cte_summed"' for fktable, *_ in cls.schema_cls._m2m_cherrypicks)
-            query = 'WITH ' + query + f'\nSELECT {summary} FROM {froms}'
-        return query
+            )""" for foreign_table, foreign_field, foreign_pk in cls.schema_cls._m2m_cherrypicks)
+        if not ctes:
+            return '', ''
+        summary_core = ','.join(f"""'{fktable}', "{fktable}_cte_summed".out """
+                                for fktable, *_ in cls.schema_cls._m2m_cherrypicks)
+        froms = ','.join(f'"{fktable}_cte_summed"' for fktable, *_ in cls.schema_cls._m2m_cherrypicks)
+        return ctes, f', (SELECT json_build_object({summary_core}) FROM {froms})'
 
 
 class ViewsBase(ViewsClassBase, CommonViewMixin):
@@ -900,7 +952,7 @@ class ViewsBase(ViewsClassBase, CommonViewMixin):
     @cached_property
     async def payload(self):
         try:
-            return await self.request.json(loads=orjson.loads)
+            return orjson.loads(await self.request.read())
         except Exception:
             raise web.HTTPBadRequest(reason='cannot read payload')
 
@@ -930,7 +982,10 @@ class ViewsBase(ViewsClassBase, CommonViewMixin):
 
     @property
     def schema(self):
-        return getattr(self, f'{self.operation}_schema')
+        try:
+            return self.operation_schemas[self.request_type][self.operation]
+        except KeyError:
+            return getattr(self, f'{self.operation}_schema')
 
     @property
     def tables_to_join(self):
@@ -940,10 +995,8 @@ class ViewsBase(ViewsClassBase, CommonViewMixin):
 
     @property
     def translated_payload(self):
-        nested_map = self.schema._nested_select_stmts
-        for k, v in self._orig_cleaned_payload.items():
-            self._orig_cleaned_payload[k] = nested_map.get(k, k)
-        return self._orig_cleaned_payload
+        nested_map = self._nested_select_stmts
+        return {nested_map.get(k, k): v for k, v in self._orig_cleaned_payload.items()}
 
     async def _clean_update_payload(self):
         ''''
@@ -999,7 +1052,7 @@ class ViewsBase(ViewsClassBase, CommonViewMixin):
                 self.request.app.error_logger.exception('Session not found or corrupted')
                 raise web.HTTPUnauthorized(reason='Session not found or corrupted')
 
-    async def _fetch(self, cleaned_payload, query):
+    async def _fetch(self, cleaned_payload, query, extra_values=None):
         '''Common logic for `get()` and `list()`'''
 
         try:
@@ -1008,6 +1061,19 @@ class ViewsBase(ViewsClassBase, CommonViewMixin):
             extended_fields = {}
         
         query, values = self._whereize_query(cleaned_payload, query, extended_fields)
+        if extra_values:
+            values.update(extra_values)
+
+        cache_key = None
+        if self.get_cache_ttl and self.operation == 'get':
+            # query and values fully determine the result, session-bound conditions included
+            cache_key = (query, dumps(values))
+            cached = self.get_cache.pop(cache_key, None)
+            if cached is not None and cached[0] > monotonic():
+                # re-insert to mark it as the most recently used
+                self.get_cache[cache_key] = cached
+                return web.Response(text=cached[1], content_type='application/json')
+
         async with self.request.app.db_pool.acquire() as conn:
             async with conn.cursor() as cur:
                 try:
@@ -1016,131 +1082,199 @@ class ViewsBase(ViewsClassBase, CommonViewMixin):
                     self.request.app.error_logger.exception('Failed to fetch results',
                                                             query=cur.query.decode())
                     raise
-                try:
-                    data = (await cur.fetchone())[0]
-                except TypeError:
-                    data = {}
-                return json_response(data)
+                row = await cur.fetchone()
+                # the JSON document comes rendered by the DB already, so pass it through as is
+                text = row[0] if row else '{}'
+
+        if cache_key is not None:
+            get_cache = self.get_cache
+            if len(get_cache) >= GET_CACHE_MAXSIZE:
+                # evict the least recently used entry
+                del get_cache[next(iter(get_cache))]
+            get_cache[cache_key] = (monotonic() + self.get_cache_ttl, text)
+        return web.Response(text=text, content_type='application/json')
 
     async def _parse_select_fields(self, get_query, query_maker=None):
         get_query_raw = self.request.query
         if 'select' in get_query:
-            unified_select_fields = get_query_raw.getall('select')
-            if ',' in unified_select_fields[0]:
-                unified_select_fields = unified_select_fields[0].split(',')
-            select_with = await self._validate_singular_payload(
-                {'select': unified_select_fields},
-                self.select_schema, 'query'
-            )
+            # accept both repeated `select` params and comma-joined ones
+            unified_select_fields = [field for fields_item in get_query_raw.getall('select')
+                                     for field in fields_item.split(',')]
+            if self.selectable_fields.issuperset(unified_select_fields):
+                # nothing for the select schema to reject, and its output would just map names to themselves
+                select_with = {field: field for field in unified_select_fields}
+            else:
+                # let the schema report what's wrong
+                select_with = await self._validate_singular_payload(
+                    {'select': unified_select_fields},
+                    self.select_schema, 'query'
+                )
             # TODO: allow for dot-separated fields to indicate linked tables' fields to be included
             self._tables_to_join = set(list(select_with) + self.cleaned_payload_keys) & self.schema._joinable_fields # noqa
-            del get_query['select']
             return query_maker(select_with, compile_selects=False, request_type=self.request_type)
 
+    @classmethod
+    @lru_cache(maxsize=1024)
+    def _render_list_query(cls, base_stmt, order_by, order_dir):
+        '''Fill in the ORDER BY part of a list query, once per ordering.
+        Limit and offset are bound as query params.'''
+        orderby = ','.join(f'"{cls.tablename}".{field}' for field in order_by)
+        return base_stmt.format(orderby=orderby, orderhow=order_dir.upper())
+
+    @classmethod
+    @lru_cache(maxsize=1024)
+    def _render_update_query(cls, query_with_where, colnames, merge=False):
+        '''Fill in the SET clause of an UPDATE query, once per payload shape.
+        With `merge`, JSON fields get deep-merged rather than overwritten (PATCH).'''
+        mergeable_fields = cls.mergeable_fields if merge else ()
+        updates = ','.join(
+            f"{colname}=jsonb_merge_deep({colname}, %({colname})s)"
+            if colname in mergeable_fields else f"{colname}=%({colname})s"
+            for colname in colnames)
+        return query_with_where.format(updates=updates)
+
     def _render_insert_query(self, payload, on_conflict=''):
-        vals = ','.join(f"%({colname})s" for colname in payload
-                        if (colname != self.pk_column_name) or self.has_autopk)
-        cols = ','.join(colname for colname in payload
-                        if (colname != self.pk_column_name) or self.has_autopk)
+        return self._insert_query_for_shape(tuple(payload), on_conflict)
+
+    def _render_insert_many_query(self, cur, payloads):
+        '''Render a single multi-row INSERT for `payloads` sharing the same shape.
+        Returns None if the schema's INSERT can't be batched (e.g. it's CTE-based).'''
+        if self.insert_many_query_stmt is None:
+            return None
+        head, row, tail = self._insert_many_query_for_shape(tuple(payloads[0]))
+        rows = ','.join(cur.mogrify(row, payload).decode() for payload in payloads)
+        return head + rows + tail
 
-        if vals and not self.has_autopk:
+    @classmethod
+    def _insert_cols_vals(cls, colnames):
+        vals = ','.join(f"%({colname})s" for colname in colnames
+                        if (colname != cls.pk_column_name) or cls.has_autopk)
+        cols = ','.join(colname for colname in colnames
+                        if (colname != cls.pk_column_name) or cls.has_autopk)
+
+        if vals and not cls.has_autopk:
             vals = ',' + vals
             cols = ',' + cols
-        return self.insert_query_stmt.format(cols=cols, vals=vals, on_conflict=on_conflict,
-                                             session=self.request.session)
+        return cols, vals
+
+    @classmethod
+    @lru_cache(maxsize=1024)
+    def _insert_query_for_shape(cls, colnames, on_conflict):
+        '''The INSERT query only depends on which columns are written,
+        so render it once per payload shape.'''
+        cols, vals = cls._insert_cols_vals(colnames)
+        return cls.insert_query_stmt.format(cols=cols, vals=vals, on_conflict=on_conflict)
+
+    @classmethod
+    @lru_cache(maxsize=1024)
+    def _insert_many_query_for_shape(cls, colnames):
+        cols, vals = cls._insert_cols_vals(colnames)
+        head, row, tail = cls.insert_many_query_stmt
+        return head.format(cols=cols), row.format(vals=vals), tail
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _render_where_query(query, wheres, joins, usings, froms):
+        '''Compose the WHERE-filled query out of its clause fragments.
+        Memoized, since a view only ever sees a handful of distinct fragment sets.'''
+        joins = ' '.join(joins)
+        using = ','.join(usings)
+        froms = ','.join(froms)
+        if using:
+            using = f'USING {using}'
+        if froms:
+            froms = f'FROM "{froms}"'
+
+        wheres_q = ' AND '.join(wheres) or ' 1=1 '
+        placeholders = tuple(dict.fromkeys(filter(None, PLACEHOLDER_PAT.findall(wheres_q))))
+        return query.format(where=wheres_q, joins=joins, using=using, froms=froms), placeholders
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _scalar_where_stmts(tablename, keys):
+        return tuple(f'"{tablename}".{key}=%(w_{key})s' for key in keys)
 
     def _whereize_query(self, cleaned_payload, query, extended_fields, in_delete=False): # noqa
         in_update = 'UPDATE' in query
-        try:
-            nested_where_stmts = self.schema._nested_where_stmts
-        except AttributeError:
-            # only inherited resources will have it
-            nested_where_stmts = []
-
-        tablename = self.schema.__tablename__
+        tablename = self.tablename
         joins = []
         usings = []
         froms = []  # for updates only
         values = {}
 
-        wheres = deque()
+        wheres = []
 
         # inject authorization condition
         with suppress(KeyError, TypeError):
             wheres.append(self.request.auth_conditions['stmt'])
 
-        for nested_field, nested_trans in nested_where_stmts.items():
-            nested_in_payload = cleaned_payload.pop(nested_field, None)
-            if nested_in_payload:
-                values.update({nested_field: nested_in_payload})
-                wheres.append(nested_trans)
-
-        for m2m_field, m2m_field_translated in self.schema._m2m_where_stmts.items():
-            relation_in_payload = cleaned_payload.pop(m2m_field, None)
-            if relation_in_payload:
-                values.update({m2m_field: relation_in_payload})
-                wheres.append(m2m_field_translated)
+        if cleaned_payload:
+            for nested_field, nested_trans in self._nested_where_stmts.items():
+                nested_in_payload = cleaned_payload.pop(nested_field, None)
+                if nested_in_payload:
+                    values.update({nested_field: nested_in_payload})
+                    wheres.append(nested_trans)
+
+            for m2m_field, m2m_field_translated in self._m2m_where_stmts.items():
+                relation_in_payload = cleaned_payload.pop(m2m_field, None)
+                if relation_in_payload:
+                    values.update({m2m_field: relation_in_payload})
+                    wheres.append(m2m_field_translated)
+
+        # with no filters and nothing to join, there's no FK condition to render
+        tables_to_join = self.tables_to_join
+        if cleaned_payload or tables_to_join:
+            for fk_field, join_obj in self._join_to_schema_where_stmt.items():
+                linked_schema = join_obj['linked_schema']
+                if fk_field in tables_to_join:
+                    joins.append(self.schema._joins[fk_field])
+                    usings.append(fk_field)
+                fk_in_payload = cleaned_payload.pop(fk_field, None)
+                if fk_in_payload:
+                    where_stmt = join_obj['unaliased_comp_query' if in_update or in_delete else 'aliased_comp_query']
+                    with suppress(AttributeError):
+                        # if <schema>.Meta defines a `default_get_critera` function
+                        # which in turn returns an expected FK value, we can ignore this
+                        for key, val in fk_in_payload.items():
+                            trans_key = f'{fk_field}_{key}'
+                            values.update({trans_key: val})
+                            wheres.append(where_stmt.format(subkey=key, fill=trans_key))
+                            if in_delete:
+                                wheres.append(f'"{tablename}".{fk_field}={fk_field}.{key}')
+                    if in_update:
+                        linked_tb_name = linked_schema.__tablename__
+                        froms.append(linked_tb_name)
+                        pk = linked_schema.pk_column_name
+                        wheres.append(f'"{linked_tb_name}".{pk}="{tablename}".{fk_field}')
 
-        
-        for fk_field, join_obj in self.schema._join_to_schema_where_stmt.items():
-            linked_schema = join_obj['linked_schema']
-            if fk_field in self.tables_to_join:
-                joins.append(self.schema._joins[fk_field])
-                usings.append(fk_field)
-            fk_in_payload = cleaned_payload.pop(fk_field, None)
-            if fk_in_payload:
-                where_stmt = join_obj['unaliased_comp_query'] if in_update or in_delete else join_obj['aliased_comp_query']
-                with suppress(AttributeError):
-                    # if <schema>.Meta defines a `default_get_critera` function
-                    # which in turn returns an expected FK value, we can ignore this
-                    for key, val in fk_in_payload.items():
-                        trans_key = f'{fk_field}_{key}'
-                        values.update({trans_key: val})
-                        wheres.append(where_stmt.format(subkey=key, fill=trans_key))
-                        if in_delete:
-                            wheres.append(f'"{tablename}".{fk_field}={fk_field}.{key}')
-                if in_update:
-                    linked_tb_name = linked_schema.__tablename__
-                    froms.append(linked_tb_name)
-                    pk = linked_schema.pk_column_name
-                    wheres.appendleft(f'"{linked_tb_name}".{pk}="{tablename}".{fk_field}')
-        
         if not self.request.auth_conditions.get('has_open_clauses', False):
-            for key in cleaned_payload.copy():
+            scalar_keys = []
+            ext_keys = []
+            for key, value in cleaned_payload.items():
                 if key in extended_fields:
                     ext_field = extended_fields[key]
                     colname = ext_field[0]
                     wheres.append(ext_field[1].format(fieldname=f'w_{colname}'))
-                    value = cleaned_payload.pop(key)
                     if isinstance(value, list):
                         values[f'w_{colname}_lower'] = value[0]
                         values[f'w_{colname}_upper'] = value[1]
                     else:
                         values[f'w_{colname}'] = ext_field[2].format(val=value)
+                    ext_keys.append(key)
                 else:
-                    values[f'w_{key}'] = cleaned_payload[key]
-                    wheres.append(f'"{tablename}".{key}=%(w_{key})s')
+                    values[f'w_{key}'] = value
+                    scalar_keys.append(key)
+            for key in ext_keys:
+                del cleaned_payload[key]
+            wheres.extend(self._scalar_where_stmts(tablename, tuple(scalar_keys)))
         else:
             # 
             values = cleaned_payload
 
-        joins = ' '.join(joins)
-        using = ','.join(usings)
-        froms = ','.join(froms)
-        if using:
-            using = f'USING {using}'
-        if froms:
-            froms = f'FROM "{froms}"'
+        query, placeholders = self._render_where_query(query, tuple(wheres), tuple(joins),
+                                                       tuple(usings), tuple(froms))
 
-        wheres_q = ' AND '.join(wheres) or ' 1=1 '
-        
-        def cyclic_context_check(vals):
-            try:
-                return wheres_q % vals
-            except KeyError as kerr:
-                missing_key = kerr.args[0]
-                vals[missing_key] = None
-                return cyclic_context_check(vals)
-
-        cyclic_context_check(values)
-        return query.format(where=wheres_q, joins=joins, using=using, froms=froms), values
+        # conditions referencing values absent from the payload compare against NULL
+        for placeholder in placeholders:
+            values.setdefault(placeholder, None)
+        return query, values
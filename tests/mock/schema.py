@@ -24,6 +24,8 @@ from postschema.view import AuxView
 
 from sqlalchemy.dialects.postgresql import JSONB
 
+DIGITS_PAT = re.compile(r'\d+')
+
 
 class PlainResource(PostSchema):
     __tablename__ = 'plainresource'
@@ -38,7 +40,7 @@ class PlainResource(PostSchema):
     intrange = fields.Integer(sqlfield=sql.Integer, validate=validate.Range(min=5, max=10))
     choice = fields.String(sqlfield=sql.String(1), validate=validate.OneOf(choices=['a', 'b']))
     date = Date()
-    list = fields.List(fields.String, sqlfield=JSONB)
+    list = fields.List(fields.String, sqlfield=JSONB, gin_index=True)
 
     class Public:
         get_by = ['id', 'name']
@@ -168,7 +170,7 @@ class Operator(ActorRoot):
                         read_only=True, primary_key=True)
     phone = fields.String(sqlfield=sql.String(32), required=True)
     city = fields.String(sqlfield=sql.String(255), required=True, index=True)
-    badges = fields.List(fields.String(), sqlfield=JSONB, required=False,
+    badges = fields.List(fields.String(), sqlfield=JSONB, required=False, gin_index=True,
                          validate=validators.must_not_be_empty)
 
     class Meta:
@@ -201,7 +203,7 @@ class Staff(ActorRoot):
 
 
 class DrawNumberView(AuxView):
-    id = fields.Integer(location='path')
+    id = fields.Integer(location='path', validate=validate.Range(max=100, error='Id value too large'))
     minint = fields.Integer(location='body')
     maxint = fields.Integer(location='body')
     query_param1 = fields.Integer(location='query')
@@ -213,17 +215,9 @@ class DrawNumberView(AuxView):
     def maxintval(self, item):
         if item < 10:
             raise ValidationError('Lesser than 10')
-
-    @validates('maxint')
-    def maxintval2(self, item):
         if item > 50:
             raise ValidationError('Greater than 50')
 
-    @validates('id')
-    def idval(self, item):
-        if item > 100:
-            raise ValidationError('Id value too large')
-
     async def patch(self):
         payload = await self.validate_payload()
         if not payload:
@@ -275,7 +269,7 @@ class CustomOpsResource(PostSchema):
 
     @validates('address')
     def val(self, item):
-        if not re.search(r'\d+', item):
+        if not DIGITS_PAT.search(item):
             raise ValidationError("This field needs to contain numbers")
 
     async def before_post(self, parent, request, data, *args):
@@ -290,10 +284,11 @@ class CustomOpsResource(PostSchema):
         return data
 
     async def after_post(self, request, payload, res):
-        payload = 'sth_else_modified'
+        values = {'newval': 'sth_else_modified', 'id': res}
+        query = "UPDATE customop SET read_only_field=%(newval)s WHERE id=%(id)s"
         async with request.app.db_pool.acquire() as conn:
             async with conn.cursor() as cur:
-                await cur.execute(f"UPDATE customop SET read_only_field='{payload}' WHERE id={res}")
+                await cur.execute(query, values)
 
     async def before_get(self, request, cleaned_payload):
         '''This is used to modify the search params'''
@@ -310,14 +305,14 @@ class CustomOpsResource(PostSchema):
 
     async def after_put(self, request, select_payload, update_payload, res):
         values = {'address': update_payload.pop('address'), 'newval': '_put'}
-        query = f"UPDATE customop SET custom_getter=custom_getter || %(newval)s WHERE address=%(address)s"
+        query = "UPDATE customop SET custom_getter=custom_getter || %(newval)s WHERE address=%(address)s"
         async with request.app.db_pool.acquire() as conn:
             async with conn.cursor() as cur:
                 await cur.execute(query, values)
 
     async def after_patch(self, request, select_payload, update_payload, res):
         values = {'address': update_payload.pop('address'), 'newval': '_patch'}
-        query = f"UPDATE customop SET custom_getter=custom_getter || %(newval)s WHERE address=%(address)s"
+        query = "UPDATE customop SET custom_getter=custom_getter || %(newval)s WHERE address=%(address)s"
         async with request.app.db_pool.acquire() as conn:
             async with conn.cursor() as cur:
                 await cur.execute(query, values)
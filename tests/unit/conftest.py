@@ -0,0 +1,152 @@
+import os
+from contextlib import asynccontextmanager
+
+# postschema reads its settings from the environment at import time
+os.environ.update({
+    'APP_MODE': 'test',
+    'FERNET_KEY': 'AszPcqphEfONbBEprJGo73fg0R-ApUsq77Rw10L5SWQ=',
+    'DEFAULT_SMS_SENDER': 'Postschema',
+    'POSTGRES_DB': 'postschemadb',
+    'POSTGRES_USER': 'postschema',
+    'POSTGRES_PASSWORD': '1234',
+    'POSTGRES_HOST': '0.0.0.0',
+    'POSTGRES_PORT': '5432',
+    'REDIS_HOST': '0.0.0.0',
+    'REDIS_PORT': '6379',
+})
+
+import orjson # noqa
+import pytest # noqa
+import sqlalchemy as sql # noqa
+from aiohttp import web # noqa
+from aiohttp.test_utils import make_mocked_request # noqa
+from marshmallow import fields # noqa
+from psycopg2.extensions import adapt # noqa
+from postschema import PostSchema, setup_postschema # noqa
+from postschema.commons import Commons # noqa
+
+
+class Gadget(PostSchema):
+    __tablename__ = 'gadget'
+    id = fields.Integer(sqlfield=sql.Integer, autoincrement=sql.Sequence('gadget_id_seq'),
+                        read_only=True, primary_key=True)
+    name = fields.String(sqlfield=sql.String(16), required=True)
+    weight = fields.Integer(sqlfield=sql.Integer)
+
+    class Public:
+        get_by = ['id', 'name']
+        list_by = ['id', 'name']
+
+        class permissions:
+            allow_all = True
+
+    class Meta:
+        get_cache_ttl = 30
+
+
+class FakeCursor:
+    '''Just enough of aiopg's cursor for the views:
+    records the executed queries and hands out the rows queued on the pool.'''
+
+    def __init__(self, pool):
+        self.pool = pool
+        self.query = b''
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        pass
+
+    @asynccontextmanager
+    async def begin(self):
+        yield
+
+    def mogrify(self, query, params):
+        return (query % {k: adapt(v).getquoted().decode() for k, v in params.items()}).encode()
+
+    async def execute(self, query, params=None):
+        self.pool.executed.append((query, params))
+        self.query = query.encode()
+
+    async def fetchone(self):
+        return self.pool.rows.pop(0)
+
+    async def fetchall(self):
+        return self.pool.rows.pop(0)
+
+
+class FakeConnection:
+    def __init__(self, pool):
+        self.pool = pool
+
+    def cursor(self):
+        return FakeCursor(self.pool)
+
+
+class FakePool:
+    def __init__(self):
+        self.executed = []
+        self.rows = []
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield FakeConnection(self)
+
+
+class PublicSession:
+    request_type = 'public'
+    is_authed = False
+
+    def __bool__(self):
+        return False
+
+
+@pytest.fixture(scope='session')
+def app():
+    app = web.Application()
+    setup_postschema(app, 'unittests')
+    # normally set up by the startup hook, which we don't run here
+    app.commons = Commons(app)
+    return app
+
+
+@pytest.fixture(scope='session')
+def gadget_view(app):
+    for route in app.router.routes():
+        if getattr(route.handler, 'tablename', None) == 'gadget':
+            return route.handler
+
+
+@pytest.fixture
+def db_pool(app):
+    app.db_pool = FakePool()
+    return app.db_pool
+
+
+@pytest.fixture
+def call_view(app, gadget_view, db_pool):
+    '''Dispatch a request to the `gadget` view, the way the middleware would.'''
+    gadget_view.get_cache.clear()
+
+    async def call(method, operation, body=None, query=''):
+        request = make_mocked_request(method, f'/gadget/{query}', app=app)
+        request.session = PublicSession()
+        request.operation = operation
+        request.auth_conditions = {}
+        if body is not None:
+            request._read_bytes = orjson.dumps(body)
+        try:
+            return await gadget_view(request)
+        except web.HTTPException as exc:
+            return exc
+    return call
+
+
+@pytest.fixture
+def read_json():
+    def read(resp):
+        body = resp.body
+        # str bodies (as the postschema exceptions pass them) end up wrapped in a payload
+        return orjson.loads(getattr(body, '_value', body))
+    return read
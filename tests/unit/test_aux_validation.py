@@ -0,0 +1,46 @@
+import orjson
+import pytest
+from aiohttp.test_utils import make_mocked_request
+
+from postschema import exceptions as post_exceptions
+from postschema.schema import validation_app, validation_session
+
+
+class AdminSession(dict):
+    request_type = 'authed'
+    is_authed = True
+
+
+def grant_role_view(app, body):
+    # the view class gets built out of `actor.GrantRole` by `setup_postschema`
+    grant_role = next(route.handler for route in app.router.routes()
+                      if getattr(route.handler, '__name__', None) == 'GrantRole')
+    request = make_mocked_request('PATCH', '/actor/grant/1/roles/', app=app)
+    request.session = AdminSession()
+    request.operation = 'patch'
+    request._read_bytes = orjson.dumps(body)
+    return grant_role(request)
+
+
+async def test_grant_role_body_validates_against_app_roles(app):
+    role = next(iter(app.allowed_roles))
+    view = grant_role_view(app, {'roles': [role]})
+
+    assert await view.validate_payload() == {'roles': [role]}
+
+
+async def test_grant_role_body_rejects_unknown_roles(app, read_json):
+    view = grant_role_view(app, {'roles': ['Nonexistent']})
+
+    with pytest.raises(post_exceptions.ValidationError) as exc:
+        await view.validate_payload()
+    assert read_json(exc.value) == {'roles': ['Invalid roles: Nonexistent']}
+
+
+async def test_validation_context_is_reset_after_load(app):
+    view = grant_role_view(app, {'roles': ['Nonexistent']})
+
+    with pytest.raises(post_exceptions.ValidationError):
+        await view.validate_payload()
+    assert validation_app.get(None) is None
+    assert validation_session.get(None) is None
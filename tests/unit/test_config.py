@@ -0,0 +1,38 @@
+import pytest
+
+from postschema import AppConfig, make_config
+
+
+def test_config_reads_as_attributes_and_mapping(app):
+    config = app.config
+
+    assert config.session_ttl == config['session_ttl'] == config.get('session_ttl')
+    assert config.get('nonexistent', 'default') == 'default'
+    assert 'session_ttl' in config and 'nonexistent' not in config
+    assert dict(config)['reset_link_ttl'] == config.reset_link_ttl
+    with pytest.raises(KeyError):
+        config['nonexistent']
+
+
+def test_config_methods_are_not_options(app):
+    assert 'get' not in app.config
+    with pytest.raises(KeyError):
+        app.config['keys']
+
+
+def test_extra_config_lands_in_config():
+    config = make_config((AppConfig(),), {'my_option': 1})
+
+    assert config.my_option == config['my_option'] == 1
+    assert config.session_ttl == AppConfig.session_ttl
+
+
+def test_extra_config_clashing_with_builtin_options_is_rejected():
+    with pytest.raises(TypeError, match='session_ttl'):
+        make_config((AppConfig(),), {'session_ttl': 1})
+
+
+@pytest.mark.parametrize('name', ['my-option', '1st', 'class', 'get', 'items', 1])
+def test_invalid_option_names_are_rejected(name):
+    with pytest.raises(ValueError, match=repr(name)):
+        make_config((), {name: 1})
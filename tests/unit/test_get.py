@@ -0,0 +1,45 @@
+import orjson
+
+
+async def test_get_passes_the_db_text_through(call_view, db_pool):
+    # the DB renders the JSON document itself, so it should hit the wire byte for byte
+    row_text = '{"id" : 1, "name" : "first", "weight" : null}'
+    db_pool.rows.append((row_text,))
+    resp = await call_view('GET', 'get', {'id': 1}, query='1/')
+
+    assert resp.status == 200
+    assert resp.content_type == 'application/json'
+    assert resp.text == row_text
+    query, params = db_pool.executed[0]
+    assert '::text' in query
+    assert params == {'w_id': 1}
+
+
+async def test_get_without_a_row_returns_an_empty_object(call_view, db_pool):
+    db_pool.rows.append(None)
+    resp = await call_view('GET', 'get', {'id': 1}, query='1/')
+
+    assert resp.status == 200
+    assert resp.content_type == 'application/json'
+    assert resp.text == '{}'
+
+
+async def test_list_passes_the_db_text_through(call_view, db_pool):
+    row_text = '{"data" : [{"id" : 1, "name" : "first"}, {"id" : 2, "name" : "second"}], "total_count" : 2}'
+    db_pool.rows.append((row_text,))
+    resp = await call_view('GET', 'list', {})
+
+    assert resp.status == 200
+    assert resp.content_type == 'application/json'
+    assert resp.text == row_text
+    assert orjson.loads(resp.text)['total_count'] == 2
+    query, params = db_pool.executed[0]
+    assert '::text' in query
+    assert params['_limit'] == 50 and params['_offset'] == 0
+
+
+async def test_list_without_rows_returns_an_empty_object(call_view, db_pool):
+    db_pool.rows.append(None)
+    resp = await call_view('GET', 'list', {})
+
+    assert resp.text == '{}'
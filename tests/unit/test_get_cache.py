@@ -0,0 +1,65 @@
+import postschema.view_bases
+
+
+async def get(call_view, db_pool, pk):
+    db_pool.rows.append((f'{{"id" : {pk}}}',))
+    resp = await call_view('GET', 'get', {'id': pk}, query=f'{pk}/')
+    # drop the row if the cache answered instead
+    db_pool.rows.clear()
+    assert resp.text == f'{{"id" : {pk}}}'
+    return resp
+
+
+def fetched_ids(db_pool):
+    return [params['w_id'] for query, params in db_pool.executed]
+
+
+async def test_repeated_get_is_served_from_cache(call_view, db_pool):
+    await get(call_view, db_pool, 1)
+    resp = await get(call_view, db_pool, 1)
+
+    assert resp.content_type == 'application/json'
+    assert fetched_ids(db_pool) == [1]
+
+
+async def test_expired_entry_is_refetched(call_view, db_pool, monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr(postschema.view_bases, 'monotonic', lambda: now)
+    await get(call_view, db_pool, 1)
+
+    now += 29
+    await get(call_view, db_pool, 1)
+    assert fetched_ids(db_pool) == [1]
+
+    now += 2
+    await get(call_view, db_pool, 1)
+    assert fetched_ids(db_pool) == [1, 1]
+
+
+async def test_cache_evicts_least_recently_used(call_view, db_pool, gadget_view, monkeypatch):
+    monkeypatch.setattr(postschema.view_bases, 'GET_CACHE_MAXSIZE', 2)
+    await get(call_view, db_pool, 1)
+    await get(call_view, db_pool, 2)
+    # hitting 1 makes 2 the least recently used one
+    await get(call_view, db_pool, 1)
+    await get(call_view, db_pool, 3)
+    assert len(gadget_view.get_cache) == 2
+    assert fetched_ids(db_pool) == [1, 2, 3]
+
+    await get(call_view, db_pool, 1)
+    assert fetched_ids(db_pool) == [1, 2, 3]
+    await get(call_view, db_pool, 2)
+    assert fetched_ids(db_pool) == [1, 2, 3, 2]
+
+
+async def test_write_through_the_view_invalidates_cache(call_view, db_pool, gadget_view):
+    await get(call_view, db_pool, 1)
+    assert gadget_view.get_cache
+
+    db_pool.rows.append(('2',))
+    resp = await call_view('POST', 'post', {'name': 'second'})
+    assert resp.status == 200
+    assert not gadget_view.get_cache
+
+    await get(call_view, db_pool, 1)
+    assert [params for query, params in db_pool.executed if 'INSERT' not in query] == [{'w_id': 1}] * 2
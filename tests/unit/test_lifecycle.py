@@ -0,0 +1,18 @@
+from aiohttp import web
+
+from postschema import cleanup
+
+
+async def test_cleanup_tolerates_resources_never_created():
+    # e.g. DB provisioning failed, so on_startup never got to create the pools
+    await cleanup(web.Application())
+
+
+async def test_cleanup_terminates_db_pool(db_pool):
+    terminated = []
+    db_pool.terminate = lambda: terminated.append(True)
+    app = web.Application()
+    app.db_pool = db_pool
+
+    await cleanup(app)
+    assert terminated == [True]
@@ -0,0 +1,45 @@
+async def test_list_body_is_inserted_with_one_multirow_insert(call_view, db_pool):
+    db_pool.rows.append([(1,), (2,)])
+    resp = await call_view('POST', 'post', [{'name': 'first', 'weight': 1}, {'name': 'second', 'weight': 2}])
+
+    assert resp.status == 200
+    assert len(db_pool.executed) == 1
+    query, params = db_pool.executed[0]
+    assert params is None
+    assert query.count('INSERT INTO "gadget"') == 1
+    assert "'first'" in query and "'second'" in query
+
+
+async def test_rows_of_different_shapes_get_an_insert_each(call_view, db_pool, read_json):
+    db_pool.rows.extend([[(1,), (3,)], [(2,)]])
+    resp = await call_view('POST', 'post', [{'name': 'a', 'weight': 1}, {'name': 'b'}, {'name': 'c', 'weight': 3}])
+
+    assert resp.status == 200
+    assert len(db_pool.executed) == 2
+    # ids are reported in the order of the posted rows, not the order of the inserts
+    assert read_json(resp) == {'id': [1, 2, 3]}
+
+
+async def test_response_lists_created_ids(call_view, db_pool, read_json):
+    db_pool.rows.append([(7,), (8,)])
+    resp = await call_view('POST', 'post', [{'name': 'first'}, {'name': 'second'}])
+
+    assert resp.content_type == 'application/json'
+    assert read_json(resp) == {'id': [7, 8]}
+
+
+async def test_invalid_row_fails_the_whole_batch(call_view, db_pool, read_json):
+    resp = await call_view('POST', 'post', [{'name': 'first'}, {'weight': 2}, {'name': 'third'}])
+
+    assert resp.status == 422
+    # errors are enveloped under the index of the offending row
+    assert read_json(resp) == {'1': {'name': ['Missing data for required field.']}}
+    assert db_pool.executed == []
+
+
+async def test_empty_list_body_is_rejected(call_view, db_pool, read_json):
+    resp = await call_view('POST', 'post', [])
+
+    assert resp.status == 422
+    assert read_json(resp) == {'payload': ['Empty payload is not accepted']}
+    assert db_pool.executed == []
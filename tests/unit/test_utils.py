@@ -0,0 +1,30 @@
+from types import SimpleNamespace
+
+import pytest
+
+from postschema.utils import parse_postgres_err
+
+
+def pg_err(detail):
+    return SimpleNamespace(diag=SimpleNamespace(message_detail=detail))
+
+
+@pytest.mark.parametrize('detail, expected', [
+    ('Key (name)=(first) already exists.',
+     {'name': ['Key (first) already exists.']}),
+    # composite keys map each column onto its own value
+    ('Key (name, weight)=(first, 1) already exists.',
+     {'name': ['Key (first) already exists.'], 'weight': ['Key (1) already exists.']}),
+    # expression keys come out under the whole expression
+    ('Key (lower(email::text))=(a@b.c) already exists.',
+     {'lower(email::text)': ['Key (a@b.c) already exists.']}),
+    ('Key (owner_id)=(12) is not present in table "actor".',
+     {'owner_id': ['Key (12) is not present in table "actor".']}),
+    # anything not of the `Key (...)=(...)` form is passed on as is
+    ('Failing row contains (1, null, 2).',
+     {'error': 'Failing row contains (1, null, 2).'}),
+    ('', {'error': ''}),
+    (None, {'error': None}),
+])
+def test_parse_postgres_err(detail, expected):
+    assert parse_postgres_err(pg_err(detail)) == expected
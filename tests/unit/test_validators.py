@@ -0,0 +1,27 @@
+import pytest
+from marshmallow import ValidationError, validate
+
+from postschema.validators import OneOf
+
+
+@pytest.mark.parametrize('value', ['c', 1, None, ['a'], {'a': 1}])
+def test_oneof_rejects_unknown_values_like_marshmallow(value):
+    with pytest.raises(ValidationError) as exc:
+        OneOf(['a', 'b'])(value)
+    with pytest.raises(ValidationError) as orig_exc:
+        validate.OneOf(['a', 'b'])(value)
+
+    assert exc.value.messages == orig_exc.value.messages == ['Must be one of: a, b.']
+
+
+def test_oneof_keeps_custom_error_and_labels():
+    validator = OneOf(['a', 'b'], labels=['A', 'B'], error='{input} is not in {labels}')
+    with pytest.raises(ValidationError) as exc:
+        validator('c')
+
+    assert exc.value.messages == ['c is not in A, B']
+
+
+@pytest.mark.parametrize('value', ['a', 'b'])
+def test_oneof_accepts_choices(value):
+    assert OneOf(['a', 'b'])(value) == value